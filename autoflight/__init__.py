@@ -20,23 +20,23 @@ Modules:
     - cli: Command-line interface
 """
 
-# Auto-install dependencies before any imports
-from autoflight._ensure_deps import ensure_dependencies
-
-ensure_dependencies()
-
-# Export main functionality
-from autoflight.orthomosaic import create_orthomosaic, OrthomosaicResult
-from autoflight.exceptions import (
-    AutoflightError,
-    ImageLoadError,
-    StitchingError,
-    OutputError,
-    ValidationError,
-    SecurityError,
-)
-from autoflight.config import AutoflightConfig, get_default_config, set_default_config
-from autoflight.security import SecurityLimits
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from autoflight.orthomosaic import create_orthomosaic, OrthomosaicResult
+    from autoflight.exceptions import (
+        AutoflightError,
+        ImageLoadError,
+        StitchingError,
+        OutputError,
+        ValidationError,
+        SecurityError,
+    )
+    from autoflight.config import AutoflightConfig, get_default_config, set_default_config
+    from autoflight.security import SecurityLimits
 
 __all__ = [
     # Main API
@@ -57,3 +57,33 @@ __all__ = [
 ]
 
 __version__ = "1.2.0"
+
+# Public names are resolved on first access (PEP 562) so that a bare
+# ``import autoflight`` does not pull in OpenCV and NumPy.
+_LAZY_EXPORTS = {
+    "create_orthomosaic": "autoflight.orthomosaic",
+    "OrthomosaicResult": "autoflight.orthomosaic",
+    "AutoflightError": "autoflight.exceptions",
+    "ImageLoadError": "autoflight.exceptions",
+    "StitchingError": "autoflight.exceptions",
+    "OutputError": "autoflight.exceptions",
+    "ValidationError": "autoflight.exceptions",
+    "SecurityError": "autoflight.exceptions",
+    "AutoflightConfig": "autoflight.config",
+    "get_default_config": "autoflight.config",
+    "set_default_config": "autoflight.config",
+    "SecurityLimits": "autoflight.security",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -12,21 +12,68 @@ _deps_checked = False
 
 
 def _is_installed(module_name: str) -> bool:
-    """Check if a module is installed."""
-    return importlib.util.find_spec(module_name) is not None
+    """Check if a module is installed.
+    
+    Modules that are already imported are found in ``sys.modules`` without
+    searching the import path.
+    """
+    return module_name in sys.modules or importlib.util.find_spec(module_name) is not None
+
+
+def _cache_dir() -> Path:
+    """Return autoflight's cache directory (``$XDG_CACHE_HOME/autoflight``)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "autoflight"
+
+
+def _marker_path() -> Path:
+    """Return the on-disk marker recording a successful dependency check.
+    
+    The package and interpreter versions are part of the file name so that
+    upgrading either one invalidates the marker automatically.
+    """
+    from autoflight import __version__
+    
+    py_version = f"{sys.version_info.major}{sys.version_info.minor}"
+    return _cache_dir() / f"deps-{__version__}-{py_version}.ok"
+
 
+def _write_marker(marker: Path) -> None:
+    """Create the dependency marker, ignoring unwritable cache directories."""
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+    except OSError:
+        pass
 
-def _install_package(package_name: str) -> None:
-    """Install a package using pip.
+
+def _pip_env() -> dict:
+    """Environment for pip subprocesses with a persistent download cache."""
+    env = dict(os.environ)
+    env.setdefault("PIP_CACHE_DIR", str(_cache_dir() / "pip"))
+    env["PIP_DISABLE_PIP_VERSION_CHECK"] = "1"
+    return env
+
+
+def _install_package(*package_names: str, binary_only: bool = False) -> None:
+    """Install one or more packages with a single pip invocation.
+    
+    pip's version self-check and interactive prompts are disabled so the
+    install never blocks on the network or on user input.
     
     Args:
-        package_name: Package specification (from hardcoded dependencies dict only).
+        package_names: Package specifications (from hardcoded dependencies dict only).
+        binary_only: Refuse source distributions (``--only-binary=:all:``).
     """
+    argv = [
+        sys.executable, "-m", "pip", "install",
+        "--disable-pip-version-check", "--no-input", "--quiet",
+    ]
+    if binary_only:
+        argv.append("--only-binary=:all:")
+    argv.extend(package_names)
     # Only silence stdout, keep stderr for error messages
-    subprocess.check_call(
-        [sys.executable, "-m", "pip", "install", package_name, "--quiet"],
-        stdout=subprocess.DEVNULL,
-    )
+    subprocess.check_call(argv, stdout=subprocess.DEVNULL, env=_pip_env())
 
 
 def ensure_dependencies() -> None:
@@ -35,6 +82,10 @@ def ensure_dependencies() -> None:
     This function checks if required dependencies (opencv-python, numpy) are installed.
     If not, it automatically installs them unless disabled via environment variable.
     
+    After the first successful check a marker file is written under
+    ``$XDG_CACHE_HOME/autoflight`` (default ``~/.cache/autoflight``) so that
+    later processes can skip the module lookups entirely.
+    
     Environment Variables:
         AUTOFLIGHT_NO_AUTO_INSTALL: Set to any value to disable auto-installation.
     """
@@ -49,6 +100,12 @@ def ensure_dependencies() -> None:
         _deps_checked = True
         return
     
+    # Skip if a previous process already verified the dependencies
+    marker = _marker_path()
+    if marker.exists():
+        _deps_checked = True
+        return
+    
     # Define required dependencies (hardcoded for security)
     dependencies = {
         "cv2": "opencv-python>=4.9.0,<5.0",
@@ -63,20 +120,34 @@ def ensure_dependencies() -> None:
     if missing_deps:
         print("Auto-installing missing dependencies...", file=sys.stderr)
         print("(Set AUTOFLIGHT_NO_AUTO_INSTALL=1 to disable)", file=sys.stderr)
-        for module_name, package_spec in missing_deps:
-            print(f"  Installing {package_spec}...", file=sys.stderr)
-            try:
-                _install_package(package_spec)
-                print(f"  ✓ {module_name} installed", file=sys.stderr)
-            except subprocess.CalledProcessError as e:
-                print(
-                    f"  ✗ Failed to install {package_spec}: {e}",
-                    file=sys.stderr,
-                )
+        specs = [package_spec for _, package_spec in missing_deps]
+        print(f"  Installing {', '.join(specs)}...", file=sys.stderr)
+        try:
+            # One resolver run for everything, and wheels only so OpenCV
+            # never falls back to a lengthy source build
+            _install_package(*specs, binary_only=True)
+        except subprocess.CalledProcessError:
+            # Retry individually so one unavailable wheel does not block the
+            # rest, then report every package that still failed
+            failed = []
+            for module_name, package_spec in missing_deps:
+                try:
+                    _install_package(package_spec, binary_only=True)
+                except subprocess.CalledProcessError as e:
+                    print(
+                        f"  ✗ Failed to install {package_spec}: {e}",
+                        file=sys.stderr,
+                    )
+                    failed.append(package_spec)
+            if failed:
+                packages = " ".join(f"'{spec}'" for spec in failed)
                 raise RuntimeError(
-                    f"Failed to auto-install dependency {package_spec}. "
-                    f"Please install manually: pip install {package_spec}"
-                ) from e
+                    f"Failed to auto-install dependencies: {', '.join(failed)}. "
+                    f"Please install manually: pip install {packages}"
+                )
+        for module_name, _ in missing_deps:
+            print(f"  ✓ {module_name} installed", file=sys.stderr)
         print("Dependencies installed successfully!", file=sys.stderr)
     
+    _write_marker(marker)
     _deps_checked = True
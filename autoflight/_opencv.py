@@ -0,0 +1,15 @@
+"""OpenCV and NumPy for the processing modules.
+
+Every module that needs OpenCV imports it from here, so the dependency check
+(and auto-install) runs before the first ``import cv2`` however the package
+is entered.
+"""
+
+from autoflight._ensure_deps import ensure_dependencies
+
+ensure_dependencies()
+
+import cv2  # noqa: E402  (must follow the dependency check)
+import numpy as np  # noqa: E402
+
+__all__ = ["cv2", "np"]
@@ -10,13 +10,16 @@ import argparse
 import logging
 import sys
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from autoflight.config import AutoflightConfig, PerformanceConfig, OutputConfig, StitchingConfig
+from autoflight import __version__
+
+if TYPE_CHECKING:
+    from autoflight.config import AutoflightConfig
 
 
 def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser for the CLI.
+    """Create the argument parser for the stitching pipeline.
     
     Returns:
         Configured ArgumentParser instance
@@ -46,6 +49,11 @@ def create_parser() -> argparse.ArgumentParser:
         default="panorama",
         help="Stitching mode: 'panorama' for standard panoramas, 'scans' for scanned images (default: panorama)"
     )
+    parser.add_argument(
+        "--gpu",
+        action="store_true",
+        help="Stitch on an OpenCL GPU when one is available"
+    )
     
     # Performance options
     parser.add_argument(
@@ -60,6 +68,11 @@ def create_parser() -> argparse.ArgumentParser:
         metavar="N",
         help="Number of parallel workers for image loading (default: 4)"
     )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Decode images in worker processes instead of threads"
+    )
     
     # Output options
     parser.add_argument(
@@ -82,6 +95,13 @@ def create_parser() -> argparse.ArgumentParser:
         help="Suppress all output except errors"
     )
     
+    parser.add_argument(
+        "-V", "--version",
+        action="version",
+        version=f"%(prog)s {__version__}",
+        help="Show the version number and exit"
+    )
+    
     # Advanced options
     parser.add_argument(
         "--progress",
@@ -127,9 +147,12 @@ def config_from_args(args: argparse.Namespace) -> AutoflightConfig:
     Returns:
         AutoflightConfig configured from arguments
     """
+    from autoflight.config import AutoflightConfig, PerformanceConfig, OutputConfig, StitchingConfig
+    
     performance = PerformanceConfig(
         parallel_loading=not args.no_parallel,
         max_workers=args.workers,
+        use_processes=args.processes,
     )
     
     output = OutputConfig(
@@ -138,6 +161,7 @@ def config_from_args(args: argparse.Namespace) -> AutoflightConfig:
     
     stitching = StitchingConfig(
         mode=args.mode,
+        try_use_gpu=args.gpu,
     )
     
     return AutoflightConfig(
@@ -148,20 +172,39 @@ def config_from_args(args: argparse.Namespace) -> AutoflightConfig:
     )
 
 
+_BAR_WIDTH = 40
+
+# Every possible progress bar, built once
+_BARS = tuple("█" * i + "░" * (_BAR_WIDTH - i) for i in range(_BAR_WIDTH + 1))
+
+# Last (percent, message) written, to skip redundant redraws
+_last_progress: Optional[tuple[int, str]] = None
+
+
 def print_progress(progress: float, message: str) -> None:
     """Print progress to stdout.
     
+    Repeated calls that would draw an identical line are skipped.
+    
     Args:
         progress: Progress value from 0.0 to 1.0
         message: Status message
     """
-    bar_width = 40
-    filled = int(bar_width * progress)
-    bar = "█" * filled + "░" * (bar_width - filled)
+    global _last_progress
+    
     percent = int(progress * 100)
-    print(f"\r[{bar}] {percent}% - {message}", end="", flush=True)
+    state = (percent, message)
+    if state == _last_progress and progress < 1.0:
+        return
+    _last_progress = state
+    
+    filled = min(max(int(_BAR_WIDTH * progress), 0), _BAR_WIDTH)
+    out = sys.stdout
+    out.write(f"\r[{_BARS[filled]}] {percent}% - {message}")
     if progress >= 1.0:
-        print()  # Newline at completion
+        out.write("\n")  # Newline at completion
+        _last_progress = None
+    out.flush()
 
 
 def run(args: Iterable[str] | None = None) -> int:
@@ -211,6 +254,8 @@ def run(args: Iterable[str] | None = None) -> int:
             mode=config.stitching.mode,
             quality=config.output.jpeg_quality,
             progress_callback=config.progress_callback,
+            use_processes=config.performance.use_processes,
+            try_use_gpu=config.stitching.try_use_gpu,
         )
         
         if not parsed.quiet:
@@ -230,17 +275,12 @@ def run(args: Iterable[str] | None = None) -> int:
         return 1
 
 
-def run_serve(args: Iterable[str] | None = None) -> int:
-    """Run the web interface server.
-
-    Args:
-        args: Arguments for the serve subcommand (defaults to sys.argv after 'serve')
+def create_serve_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the ``serve`` subcommand.
 
     Returns:
-        Exit code (0 for success, non-zero for failure)
+        Configured ArgumentParser instance
     """
-    from autoflight.server import run_server
-
     parser = argparse.ArgumentParser(
         description="Start the autoflight web interface server",
         prog="autoflight serve",
@@ -264,21 +304,70 @@ def run_serve(args: Iterable[str] | None = None) -> int:
         action="store_true",
         help="Do not automatically open a browser window",
     )
+    parser.add_argument(
+        "--reuse-port",
+        action="store_true",
+        help="Bind with SO_REUSEPORT so several servers can share the port",
+    )
+    parser.add_argument(
+        "--max-request-size",
+        type=int,
+        default=512,
+        metavar="MB",
+        help="Largest upload request accepted, in MiB (default: 512)",
+    )
+    return parser
+
+
+def run_serve(args: Iterable[str] | None = None) -> int:
+    """Run the web interface server.
 
+    Args:
+        args: Arguments for the serve subcommand (defaults to sys.argv after 'serve')
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    parser = create_serve_parser()
     parsed = parser.parse_args(list(args) if args is not None else [])
+
+    # Imported only after parsing so that --help never loads the server stack
+    from autoflight.server import run_server
+
     try:
-        run_server(host=parsed.host, port=parsed.port, open_browser=not parsed.no_open)
+        run_server(
+            host=parsed.host,
+            port=parsed.port,
+            open_browser=not parsed.no_open,
+            reuse_port=parsed.reuse_port,
+            max_request_size=parsed.max_request_size * 1024 * 1024,
+        )
         return 0
     except OSError as e:
         print(f"Error: Could not start server: {e}", file=sys.stderr)
         return 1
 
 
+def _sniff_subcommand(argv: list[str]) -> str:
+    """Determine which subcommand is being invoked without building a parser.
+
+    Args:
+        argv: Command-line arguments, excluding the program name
+
+    Returns:
+        ``"serve"`` for the web interface, ``"main"`` for the stitching pipeline
+    """
+    if argv and argv[0] == "serve":
+        return "serve"
+    return "main"
+
+
 def main(args: Iterable[str] | None = None) -> int:
     """Main entry point for the CLI.
 
     Dispatches to the ``serve`` subcommand when the first argument is
-    ``"serve"``; otherwise runs the standard stitching pipeline.
+    ``"serve"``; otherwise runs the standard stitching pipeline. Only the
+    parser for the selected subcommand is constructed.
 
     Args:
         args: Command-line arguments (defaults to sys.argv)
@@ -287,10 +376,9 @@ def main(args: Iterable[str] | None = None) -> int:
         Exit code (0 for success, non-zero for failure)
     """
     argv = list(args) if args is not None else sys.argv[1:]
-    if argv and argv[0] == "serve":
+    if _sniff_subcommand(argv) == "serve":
         return run_serve(argv[1:])
-    # Pass None so argparse uses sys.argv when args was not supplied explicitly
-    return run(args if args is not None else None)
+    return run(argv)
 
 
 if __name__ == "__main__":
@@ -8,14 +8,21 @@ and output options.
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
-from autoflight.security import SecurityLimits
+if TYPE_CHECKING:
+    from autoflight.security import SecurityLimits
 
+# ``slots=True`` is only understood by dataclasses on Python 3.10+
+_DATACLASS_OPTIONS: Dict[str, Any] = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _DATACLASS_OPTIONS["slots"] = True
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PerformanceConfig:
     """Performance-related configuration settings.
     
@@ -23,13 +30,15 @@ class PerformanceConfig:
         parallel_loading: Whether to load images in parallel
         max_workers: Maximum number of parallel workers for image loading
         memory_limit_mb: Optional memory limit in megabytes
+        use_processes: Whether to decode images in worker processes instead of threads
     """
     parallel_loading: bool = True
     max_workers: int = 4
     memory_limit_mb: Optional[int] = None
+    use_processes: bool = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class OutputConfig:
     """Output-related configuration settings.
     
@@ -50,7 +59,7 @@ class OutputConfig:
             raise ValueError(f"png_compression must be 0-9, got {self.png_compression}")
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class StitchingConfig:
     """Stitching-related configuration settings.
     
@@ -67,16 +76,24 @@ class StitchingConfig:
             raise ValueError(f"mode must be 'panorama' or 'scans', got {self.mode}")
 
 
+def _default_security_limits() -> SecurityLimits:
+    """Create default security limits, importing the security module on demand."""
+    from autoflight.security import SecurityLimits
+    
+    return SecurityLimits()
+
+
 # Type alias for progress callbacks
 ProgressCallback = Callable[[float, str], None]
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AutoflightConfig:
     """Main configuration class for autoflight.
     
     This class combines all configuration settings and provides
-    a centralized way to configure the autoflight package.
+    a centralized way to configure the autoflight package. Configuration
+    objects are immutable; use ``dataclasses.replace`` to derive variants.
     
     Attributes:
         performance: Performance-related settings
@@ -89,7 +106,7 @@ class AutoflightConfig:
     performance: PerformanceConfig = field(default_factory=PerformanceConfig)
     output: OutputConfig = field(default_factory=OutputConfig)
     stitching: StitchingConfig = field(default_factory=StitchingConfig)
-    security: SecurityLimits = field(default_factory=SecurityLimits)
+    security: SecurityLimits = field(default_factory=_default_security_limits)
     verbose: bool = False
     progress_callback: Optional[ProgressCallback] = None
     
@@ -100,34 +117,48 @@ class AutoflightConfig:
         Supported environment variables:
         - AUTOFLIGHT_PARALLEL: Enable/disable parallel loading (1/0)
         - AUTOFLIGHT_MAX_WORKERS: Maximum parallel workers
+        - AUTOFLIGHT_USE_PROCESSES: Decode images in worker processes (1/0)
         - AUTOFLIGHT_JPEG_QUALITY: JPEG output quality
         - AUTOFLIGHT_MODE: Stitching mode
+        - AUTOFLIGHT_USE_GPU: Stitch on an OpenCL device when available (1/0)
         - AUTOFLIGHT_VERBOSE: Enable verbose logging (1/0)
         
         Returns:
             AutoflightConfig instance configured from environment
         """
-        config = cls()
+        performance: Dict[str, Any] = {}
+        output: Dict[str, Any] = {}
+        stitching: Dict[str, Any] = {}
+        general: Dict[str, Any] = {}
         
         # Performance settings
         if "AUTOFLIGHT_PARALLEL" in os.environ:
-            config.performance.parallel_loading = os.environ["AUTOFLIGHT_PARALLEL"] == "1"
+            performance["parallel_loading"] = os.environ["AUTOFLIGHT_PARALLEL"] == "1"
         if "AUTOFLIGHT_MAX_WORKERS" in os.environ:
-            config.performance.max_workers = int(os.environ["AUTOFLIGHT_MAX_WORKERS"])
+            performance["max_workers"] = int(os.environ["AUTOFLIGHT_MAX_WORKERS"])
+        if "AUTOFLIGHT_USE_PROCESSES" in os.environ:
+            performance["use_processes"] = os.environ["AUTOFLIGHT_USE_PROCESSES"] == "1"
         
         # Output settings
         if "AUTOFLIGHT_JPEG_QUALITY" in os.environ:
-            config.output.jpeg_quality = int(os.environ["AUTOFLIGHT_JPEG_QUALITY"])
+            output["jpeg_quality"] = int(os.environ["AUTOFLIGHT_JPEG_QUALITY"])
         
         # Stitching settings
         if "AUTOFLIGHT_MODE" in os.environ:
-            config.stitching.mode = os.environ["AUTOFLIGHT_MODE"]
+            stitching["mode"] = os.environ["AUTOFLIGHT_MODE"]
+        if "AUTOFLIGHT_USE_GPU" in os.environ:
+            stitching["try_use_gpu"] = os.environ["AUTOFLIGHT_USE_GPU"] == "1"
         
         # General settings
         if "AUTOFLIGHT_VERBOSE" in os.environ:
-            config.verbose = os.environ["AUTOFLIGHT_VERBOSE"] == "1"
+            general["verbose"] = os.environ["AUTOFLIGHT_VERBOSE"] == "1"
         
-        return config
+        return cls(
+            performance=PerformanceConfig(**performance),
+            output=OutputConfig(**output),
+            stitching=StitchingConfig(**stitching),
+            **general,
+        )
     
     def with_progress(self, callback: ProgressCallback) -> "AutoflightConfig":
         """Return a new config with a progress callback set.
@@ -138,14 +169,7 @@ class AutoflightConfig:
         Returns:
             New AutoflightConfig with the callback set
         """
-        return AutoflightConfig(
-            performance=self.performance,
-            output=self.output,
-            stitching=self.stitching,
-            security=self.security,
-            verbose=self.verbose,
-            progress_callback=callback,
-        )
+        return replace(self, progress_callback=callback)
 
 
 # Global default configuration
@@ -2,28 +2,40 @@
 
 from __future__ import annotations
 
+import atexit
+import collections
 import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import itertools
 import logging
+import os
+import stat
+import threading
 from pathlib import Path
-from typing import List, Optional, Callable, cast
-
-import cv2
-import numpy as np
+from typing import (
+    TYPE_CHECKING, Any, Callable, ContextManager, Deque, Dict, Iterator, List, Literal, Optional,
+    Tuple,
+)
 
 from autoflight.exceptions import ImageLoadError, ValidationError
 from autoflight.security import (
     SecurityLimits,
     validate_file_size,
     validate_file_count,
-    validate_path_security,
     get_default_limits,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Export public API
 __all__ = [
     "load_images",
+    "iter_images",
     "load_single_image",
     "is_supported_image",
     "validate_path",
@@ -32,6 +44,24 @@ __all__ = [
 
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff"}
 
+# Extensions without the leading dot, for matching on bare file names
+_SUFFIX_SET = frozenset(ext[1:] for ext in SUPPORTED_EXTENSIONS)
+
+# All-lowercase and all-uppercase spellings, checked with a single endswith()
+_SUFFIX_TUPLE = tuple(sorted(SUPPORTED_EXTENSIONS)) + tuple(
+    sorted(ext.upper() for ext in SUPPORTED_EXTENSIONS)
+)
+
+# Below this many images, process start-up costs more than it saves
+_MIN_IMAGES_FOR_PROCESSES = 4
+
+# Decoded-image cache limits (override with AUTOFLIGHT_DECODE_CACHE_MB)
+DEFAULT_DECODE_CACHE_MB = 2048
+
+# Decode thread pools reused across load_images calls, keyed by worker count
+_thread_pools: Dict[int, concurrent.futures.ThreadPoolExecutor] = {}
+_thread_pools_lock = threading.Lock()
+
 
 def validate_path(path: Path, must_exist: bool = True, must_be_dir: bool = False) -> None:
     """Validate a file system path.
@@ -44,17 +74,21 @@ def validate_path(path: Path, must_exist: bool = True, must_be_dir: bool = False
     Raises:
         ValidationError: If validation fails
     """
-    if must_exist and not path.exists():
-        raise ValidationError(f"Path does not exist: {path}")
+    # Security: reject paths the OS would refuse or silently truncate
+    if "\x00" in str(path):
+        raise ValidationError(f"Invalid path: {path!r}")
     
-    if must_be_dir and must_exist and not path.is_dir():
-        raise ValidationError(f"Path is not a directory: {path}")
+    if not must_exist:
+        return
     
-    # Security: Check for path traversal attempts
+    # A single stat answers both the existence and the directory check
     try:
-        validate_path_security(path)
-    except Exception as e:
-        raise ValidationError(f"Invalid path: {path}") from e
+        st = os.stat(path)
+    except OSError as e:
+        raise ValidationError(f"Path does not exist: {path}") from e
+    
+    if must_be_dir and not stat.S_ISDIR(st.st_mode):
+        raise ValidationError(f"Path is not a directory: {path}")
 
 
 def is_supported_image(path: Path) -> bool:
@@ -66,7 +100,263 @@ def is_supported_image(path: Path) -> bool:
     Returns:
         True if the file has a supported extension
     """
-    return path.suffix.lower() in SUPPORTED_EXTENSIONS
+    return _has_supported_suffix(path.name)
+
+
+def _has_supported_suffix(name: str) -> bool:
+    """Check a bare file name against the supported extensions."""
+    dot = name.rfind(".")
+    if dot <= 0:
+        return False
+    if name.endswith(_SUFFIX_TUPLE):
+        return True
+    # Mixed-case extensions such as ".Jpg"
+    return name[dot + 1:].lower() in _SUFFIX_SET
+
+
+def _scan_image_entries(input_dir: Path) -> List[os.DirEntry]:
+    """List supported image files in a directory, sorted by name.
+    
+    Uses ``os.scandir`` so the file-type check comes from the directory
+    listing itself instead of one ``stat`` call per entry. The entries
+    cache their ``stat()`` result for the size checks.
+    """
+    with os.scandir(input_dir) as it:
+        entries = [
+            entry for entry in it
+            if _has_supported_suffix(entry.name) and entry.is_file()
+        ]
+    # Sorting plain names orders entries exactly as sorting the Paths
+    # would, without Path's per-comparison part splitting
+    entries.sort(key=lambda entry: os.path.normcase(entry.name))
+    return entries
+
+
+def _decode_cache_dir() -> Optional[Path]:
+    """Return the decoded-image cache directory, or None if caching is disabled.
+    
+    The cache is opt-in: it stores a raw copy of every decoded image, which
+    only pays off when the same folder is processed repeatedly.
+    
+    Environment Variables:
+        AUTOFLIGHT_DECODE_CACHE: Set to ``1`` to enable the decode cache.
+        XDG_CACHE_HOME: Base cache directory (default: ``~/.cache``).
+    """
+    if os.environ.get("AUTOFLIGHT_DECODE_CACHE") != "1":
+        return None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "autoflight" / "decode"
+
+
+def _decode_cache_key(path: Path, st: os.stat_result) -> str:
+    """Build a cache key that changes whenever the source file changes."""
+    ident = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    return hashlib.blake2b(ident.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_decode_cache(cache_path: Path) -> Optional[np.ndarray]:
+    """Load a cached decode, returning None on a miss or unreadable entry."""
+    from autoflight._opencv import np
+    
+    try:
+        image: np.ndarray = np.load(cache_path)
+        os.utime(cache_path)  # mark as recently used
+    except (OSError, ValueError):
+        return None
+    return image
+
+
+def _write_decode_cache(cache_path: Path, image: np.ndarray) -> None:
+    """Store a decoded image in the cache.
+    
+    Old entries are evicted once per batch by :func:`_prune_decode_cache`,
+    not after every write.
+    """
+    from autoflight._opencv import np
+    
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.save(f, image)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write decode cache entry {cache_path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _prune_decode_cache(cache_dir: Path) -> None:
+    """Remove least recently used cache entries beyond the size limit."""
+    try:
+        limit = int(os.environ.get("AUTOFLIGHT_DECODE_CACHE_MB", DEFAULT_DECODE_CACHE_MB))
+    except ValueError:
+        limit = DEFAULT_DECODE_CACHE_MB
+    max_bytes = limit * 1024 * 1024
+    
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".npy"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+    except OSError:
+        return
+    
+    if total <= max_bytes:
+        return
+    for _, size, entry_path in sorted(entries):
+        try:
+            os.unlink(entry_path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+# Shared TurboJPEG decoder; None until probed, and after a failed probe
+_turbojpeg: Optional[Callable[[np.ndarray], np.ndarray]] = None
+_turbojpeg_probed = False
+_turbojpeg_lock = threading.Lock()
+
+# Bytes scanned for the EXIF block; APP1 segments are capped at 64 KiB
+_EXIF_SCAN_BYTES = 128 * 1024
+
+# TIFF inputs above this size are memory-mapped instead of decoded
+_MEMMAP_TIFF_MIN_BYTES = 128 * 1024 * 1024
+
+
+def _get_turbojpeg() -> Optional[Callable[[np.ndarray], np.ndarray]]:
+    """Return a shared libjpeg-turbo BGR decoder, or None if unavailable.
+    
+    PyTurboJPEG is an optional dependency; without it (or without the
+    libturbojpeg shared library) JPEGs are decoded by OpenCV.
+    """
+    global _turbojpeg, _turbojpeg_probed
+    
+    if not _turbojpeg_probed:
+        with _turbojpeg_lock:
+            if not _turbojpeg_probed:
+                try:
+                    from turbojpeg import TJPF_BGR, TurboJPEG  # type: ignore[import-not-found]
+                    
+                    _turbojpeg = functools.partial(TurboJPEG().decode, pixel_format=TJPF_BGR)
+                except (ImportError, OSError, RuntimeError) as e:
+                    logger.debug(f"TurboJPEG unavailable, using OpenCV for JPEG: {e}")
+                _turbojpeg_probed = True
+    
+    return _turbojpeg
+
+
+def _jpeg_orientation(data: bytes) -> int:
+    """Return the EXIF orientation tag of a JPEG (1 if absent or unreadable).
+    
+    Args:
+        data: Leading bytes of the JPEG file
+        
+    Returns:
+        Orientation value from 1 to 8
+    """
+    i = 2
+    while i + 4 <= len(data) and data[i] == 0xFF:
+        marker = data[i + 1]
+        # Metadata segments all precede start-of-scan
+        if marker in (0xD9, 0xDA):
+            break
+        length = int.from_bytes(data[i + 2:i + 4], "big")
+        if marker == 0xE1 and data[i + 4:i + 10] == b"Exif\x00\x00":
+            return _tiff_orientation(data[i + 10:i + 2 + length])
+        i += 2 + length
+    return 1
+
+
+def _tiff_orientation(tiff: bytes) -> int:
+    """Read the orientation tag from the first IFD of a TIFF header."""
+    order: Literal["little", "big"]
+    if tiff[:2] == b"II":
+        order = "little"
+    elif tiff[:2] == b"MM":
+        order = "big"
+    else:
+        return 1
+    
+    ifd = int.from_bytes(tiff[4:8], order)
+    count = int.from_bytes(tiff[ifd:ifd + 2], order)
+    for k in range(count):
+        entry = ifd + 2 + 12 * k
+        if entry + 12 > len(tiff):
+            break
+        if int.from_bytes(tiff[entry:entry + 2], order) == 0x0112:
+            return int.from_bytes(tiff[entry + 8:entry + 10], order)
+    return 1
+
+
+def _decode_jpeg_turbo(buffer: np.ndarray) -> Optional[np.ndarray]:
+    """Decode a JPEG with libjpeg-turbo, or return None to defer to OpenCV.
+    
+    Rotated images are left to OpenCV, which applies the EXIF orientation
+    that TurboJPEG ignores; anything TurboJPEG rejects (CMYK, truncated
+    files) also falls back.
+    """
+    decode = _get_turbojpeg()
+    if decode is None:
+        return None
+    
+    if _jpeg_orientation(buffer[:_EXIF_SCAN_BYTES].tobytes()) != 1:
+        return None
+    
+    try:
+        return decode(buffer)
+    except Exception as e:
+        logger.debug(f"TurboJPEG decode failed, falling back to OpenCV: {e}")
+        return None
+
+
+def _memmap_tiff(path: Path, file_size: int) -> Optional[np.ndarray]:
+    """Load a large uncompressed 8-bit RGB TIFF through a memory map.
+    
+    The mapped RGB pixels are converted straight into a contiguous BGR
+    array, so the file is never read into an intermediate buffer and then
+    decoded. The array is what the stitcher needs as input, so it does not
+    make another copy. Returns None (so the caller decodes normally) for small files, when
+    tifffile is not installed, or for layouts that cannot be presented as
+    the BGR image OpenCV would return (compressed, tiled, non-RGB, 16-bit).
+    
+    Args:
+        path: Path to the TIFF file
+        file_size: Size of the file in bytes
+        
+    Returns:
+        Contiguous BGR image, or None
+    """
+    if file_size <= _MEMMAP_TIFF_MIN_BYTES:
+        return None
+    
+    try:
+        import tifffile  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    
+    try:
+        mapped = tifffile.memmap(str(path), mode="r")
+    except Exception as e:
+        logger.debug(f"Cannot memory-map {path}, decoding instead: {e}")
+        return None
+    
+    if mapped.dtype != "uint8" or mapped.ndim != 3 or mapped.shape[2] != 3:
+        return None
+    
+    from autoflight._opencv import cv2
+    
+    logger.debug(f"Memory-mapped TIFF: {path}")
+    image: np.ndarray = cv2.cvtColor(mapped, cv2.COLOR_RGB2BGR)
+    return image
 
 
 def load_single_image(
@@ -76,6 +366,14 @@ def load_single_image(
 ) -> np.ndarray:
     """Load a single image from disk with security validation.
     
+    With ``AUTOFLIGHT_DECODE_CACHE=1``, decoded pixels are cached on disk
+    keyed by path, modification time and size, so repeated runs over the
+    same directory skip the decode step; :func:`load_images` and
+    :func:`iter_images` trim the cache to its size limit after each batch.
+    JPEGs are decoded with libjpeg-turbo when PyTurboJPEG is installed, and
+    large uncompressed TIFFs are read through a memory map when tifffile is
+    installed.
+    
     Args:
         path: Path to the image file
         validate_security: Whether to perform security validation
@@ -90,20 +388,228 @@ def load_single_image(
     """
     logger.debug(f"Loading image: {path}")
     
+    # One stat serves the size check, the TIFF mapping and the cache key
+    st: Optional[os.stat_result]
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        if validate_security:
+            raise ValidationError(f"Cannot access file: {path}") from e
+        st = None  # Reported as a read failure below
+    
     # Security validation
-    if validate_security:
+    if validate_security and st is not None:
         if limits is None:
             limits = get_default_limits()
-        validate_file_size(path, limits=limits)
+        validate_file_size(path, limits=limits, file_size=st.st_size)
     
-    # Load the image
-    image = cv2.imread(str(path))
+    if st is not None and path.suffix.lower() in (".tif", ".tiff"):
+        mapped = _memmap_tiff(path, st.st_size)
+        if mapped is not None:
+            return mapped
+    
+    # Serve from the decode cache when the source file is unchanged
+    cache_path = None
+    cache_dir = _decode_cache_dir()
+    if cache_dir is not None and st is not None:
+        cache_path = cache_dir / f"{_decode_cache_key(path, st)}.npy"
+    if cache_path is not None and cache_path.exists():
+        cached = _read_decode_cache(cache_path)
+        if cached is not None:
+            logger.debug(f"Decode cache hit: {path}")
+            return cached
+    
+    # Deferred so that importing this module does not pull in OpenCV
+    from autoflight._opencv import cv2, np
+
+    # Read the raw bytes ourselves and decode from memory; this skips
+    # imread's own path handling and file I/O layer
+    try:
+        buffer = np.fromfile(str(path), dtype=np.uint8)
+    except OSError as e:
+        raise ImageLoadError(f"Failed to read image: {path}") from e
+    
+    image = None
+    if buffer.size and path.suffix.lower() in (".jpg", ".jpeg"):
+        image = _decode_jpeg_turbo(buffer)
+    if image is None and buffer.size:
+        image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
     if image is None:
         raise ImageLoadError(f"Failed to load image: {path}")
     
+    if cache_path is not None:
+        _write_decode_cache(cache_path, image)
+    
     return image
 
 
+def _init_process_worker() -> None:
+    """Limit OpenCV to one thread inside each decode process."""
+    from autoflight._opencv import cv2
+    
+    cv2.setNumThreads(1)
+
+
+def _get_thread_pool(max_workers: int) -> concurrent.futures.ThreadPoolExecutor:
+    """Return the shared decode thread pool for ``max_workers`` threads.
+    
+    Pools are created on first use and kept for the life of the process, so
+    repeated loads (batch scripts, the web server) skip thread start-up.
+    """
+    with _thread_pools_lock:
+        pool = _thread_pools.get(max_workers)
+        if pool is None:
+            pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="autoflight-decode"
+            )
+            _thread_pools[max_workers] = pool
+        return pool
+
+
+def _shutdown_thread_pools() -> None:
+    """Shut down the shared decode thread pools."""
+    with _thread_pools_lock:
+        pools = list(_thread_pools.values())
+        _thread_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False)
+
+
+atexit.register(_shutdown_thread_pools)
+
+
+def _iter_parallel(
+    image_paths: List[Path],
+    max_workers: int,
+    validate_security: bool,
+    limits: Optional[SecurityLimits],
+    use_processes: bool = False,
+) -> Iterator[np.ndarray]:
+    """Decode images on a worker pool, yielding them in path order.
+    
+    At most ``2 * max_workers`` images are in flight (decoding or decoded
+    but not yet consumed), so memory stays bounded however many paths
+    there are.
+    """
+    executor: concurrent.futures.Executor
+    owner: ContextManager[Any]
+    if use_processes:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_process_worker
+        )
+        owner = executor
+    else:
+        # The shared thread pool outlives this call
+        executor = _get_thread_pool(max_workers)
+        owner = contextlib.nullcontext()
+    
+    remaining = iter(image_paths)
+    pending: Deque[Tuple[Path, concurrent.futures.Future]] = collections.deque()
+    
+    def submit(count: int) -> None:
+        for path in itertools.islice(remaining, count):
+            future = executor.submit(load_single_image, path, validate_security, limits)
+            pending.append((path, future))
+    
+    with owner:
+        try:
+            submit(2 * max_workers)
+            while pending:
+                path, future = pending.popleft()
+                try:
+                    image = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to load image {path}: {e}")
+                    raise
+                # Refill the window before handing the image to the consumer
+                submit(1)
+                yield image
+        finally:
+            # Don't decode (and hold) the rest of the batch for nothing
+            for _, future in pending:
+                future.cancel()
+
+
+def _iter_loaded(
+    image_paths: List[Path],
+    parallel: bool,
+    max_workers: int,
+    validate_security: bool,
+    limits: Optional[SecurityLimits],
+    progress_callback: Optional[Callable[[float, str], None]],
+    use_processes: bool,
+) -> Iterator[np.ndarray]:
+    """Yield decoded images in path order, reporting progress as they arrive."""
+    total = len(image_paths)
+    
+    if progress_callback:
+        progress_callback(0.0, f"Loading {total} images...")
+    
+    if parallel and total > 1:
+        use_processes = use_processes and total >= _MIN_IMAGES_FOR_PROCESSES
+        kind = "processes" if use_processes else "threads"
+        logger.debug(f"Loading images in parallel with {max_workers} {kind}")
+        # OpenCV's thread count is process-wide, so it is left alone here: a
+        # suspended iterator must not slow down the caller's own OpenCV work.
+        # Decode processes limit themselves in _init_process_worker.
+        images = _iter_parallel(
+            image_paths, max_workers, validate_security, limits, use_processes=use_processes
+        )
+        for i, image in enumerate(images, start=1):
+            if progress_callback:
+                progress_callback(i / total * 0.5, f"Loaded {i}/{total} images")
+            yield image
+    else:
+        logger.debug("Loading images sequentially")
+        for i, path in enumerate(image_paths, start=1):
+            image = load_single_image(path, validate_security, limits)
+            if progress_callback:
+                progress_callback(i / total * 0.5, f"Loaded {i}/{total} images")
+            yield image
+    
+    # Trim the decode cache once for the whole batch
+    cache_dir = _decode_cache_dir()
+    if cache_dir is not None:
+        _prune_decode_cache(cache_dir)
+
+
+def _find_image_paths(
+    input_dir: Path,
+    validate_security: bool,
+    limits: Optional[SecurityLimits],
+) -> List[Path]:
+    """List the supported images in ``input_dir``, enforcing the security limits.
+    
+    File sizes are checked here in one pass, before any decoding starts, so
+    the loaders can skip the per-file check.
+    """
+    validate_path(input_dir, must_exist=True, must_be_dir=True)
+    
+    # Get all supported image paths
+    entries = _scan_image_entries(input_dir)
+    
+    if not entries:
+        raise ImageLoadError(f"No supported images found in {input_dir}")
+    
+    image_paths = [input_dir / entry.name for entry in entries]
+    
+    # Security: Validate file count and sizes
+    if validate_security:
+        if limits is None:
+            limits = get_default_limits()
+        validate_file_count(len(image_paths), limits=limits)
+        for path, entry in zip(image_paths, entries):
+            # Cached per entry, and already filled in by scandir on Windows
+            try:
+                file_size = entry.stat().st_size
+            except OSError as e:
+                raise ValidationError(f"Cannot access file: {path}") from e
+            validate_file_size(path, limits=limits, file_size=file_size)
+    
+    logger.info(f"Found {len(image_paths)} images in {input_dir}")
+    return image_paths
+
+
 def load_images(
     input_dir: Path,
     parallel: bool = True,
@@ -111,6 +617,7 @@ def load_images(
     validate_security: bool = True,
     limits: Optional[SecurityLimits] = None,
     progress_callback: Optional[Callable[[float, str], None]] = None,
+    use_processes: bool = False,
 ) -> List[np.ndarray]:
     """Load all supported images from a directory.
     
@@ -121,6 +628,9 @@ def load_images(
         validate_security: Whether to perform security validation
         limits: Optional security limits (uses defaults if not provided)
         progress_callback: Optional callback for progress reporting (progress, message)
+        use_processes: Decode in worker processes instead of threads when parallel.
+            Only used for batches of at least four images, where it pays for
+            the process start-up cost.
         
     Returns:
         List of loaded images
@@ -130,61 +640,54 @@ def load_images(
         ImageLoadError: If no images are found or loading fails
         SecurityError: If security validation fails
     """
-    validate_path(input_dir, must_exist=True, must_be_dir=True)
-    
-    # Get all supported image paths
-    image_paths = sorted([
-        path for path in input_dir.iterdir()
-        if path.is_file() and is_supported_image(path)
-    ])
-    
-    if not image_paths:
-        raise ImageLoadError(f"No supported images found in {input_dir}")
-    
-    # Security: Validate file count
-    if validate_security:
-        if limits is None:
-            limits = get_default_limits()
-        validate_file_count(len(image_paths), limits=limits)
-    
-    logger.info(f"Found {len(image_paths)} images in {input_dir}")
-    
-    if progress_callback:
-        progress_callback(0.0, f"Loading {len(image_paths)} images...")
-    
-    if parallel and len(image_paths) > 1:
-        logger.debug(f"Loading images in parallel with {max_workers} workers")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(load_single_image, path, validate_security, limits): i
-                for i, path in enumerate(image_paths)
-            }
-            images_by_index: List[Optional[np.ndarray]] = [None] * len(image_paths)
-            completed = 0
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    image = future.result()
-                    index = futures[future]
-                    images_by_index[index] = image
-                    completed += 1
-                    if progress_callback:
-                        progress = completed / len(image_paths)
-                        progress_callback(progress * 0.5, f"Loaded {completed}/{len(image_paths)} images")
-                except Exception as e:
-                    index = futures[future]
-                    failed_path = image_paths[index]
-                    logger.error(f"Failed to load image {failed_path}: {e}")
-                    raise
-            images = cast(List[np.ndarray], images_by_index)
-    else:
-        logger.debug("Loading images sequentially")
-        images = []
-        for i, path in enumerate(image_paths):
-            image = load_single_image(path, validate_security, limits)
-            images.append(image)
-            if progress_callback:
-                progress = (i + 1) / len(image_paths)
-                progress_callback(progress * 0.5, f"Loaded {i + 1}/{len(image_paths)} images")
-    
+    image_paths = _find_image_paths(input_dir, validate_security, limits)
+    # Sizes were validated up front; the loaders need not re-check them
+    images = list(
+        _iter_loaded(
+            image_paths, parallel, max_workers, False, limits,
+            progress_callback, use_processes,
+        )
+    )
     logger.info(f"Loaded {len(images)} images successfully")
     return images
+
+
+def iter_images(
+    input_dir: Path,
+    parallel: bool = True,
+    max_workers: int = 4,
+    validate_security: bool = True,
+    limits: Optional[SecurityLimits] = None,
+    progress_callback: Optional[Callable[[float, str], None]] = None,
+    use_processes: bool = False,
+) -> Iterator[np.ndarray]:
+    """Lazily load all supported images from a directory, in sorted order.
+    
+    Unlike :func:`load_images`, decoded images are handed out one at a time
+    and at most ``2 * max_workers`` are held at once, so a consumer that
+    processes and releases each image keeps memory bounded. The directory
+    is scanned and validated immediately; decoding starts on first use.
+    
+    Args:
+        input_dir: Directory containing images
+        parallel: Whether to load images in parallel
+        max_workers: Maximum number of parallel workers
+        validate_security: Whether to perform security validation
+        limits: Optional security limits (uses defaults if not provided)
+        progress_callback: Optional callback for progress reporting (progress, message)
+        use_processes: Decode in worker processes instead of threads when parallel
+        
+    Returns:
+        Iterator over the loaded images
+        
+    Raises:
+        ValidationError: If directory is invalid
+        ImageLoadError: If no images are found or loading fails
+        SecurityError: If security validation fails
+    """
+    image_paths = _find_image_paths(input_dir, validate_security, limits)
+    # Sizes were validated up front; the loaders need not re-check them
+    return _iter_loaded(
+        image_paths, parallel, max_workers, False, limits,
+        progress_callback, use_processes,
+    )
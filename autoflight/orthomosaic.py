@@ -44,6 +44,8 @@ def create_orthomosaic(
     mode: str = "panorama",
     quality: int = 95,
     progress_callback: Optional[ProgressCallback] = None,
+    use_processes: bool = False,
+    try_use_gpu: bool = False,
 ) -> OrthomosaicResult:
     """Create an orthomosaic from images in input_dir and write to output_path.
     
@@ -59,6 +61,8 @@ def create_orthomosaic(
         quality: JPEG quality setting (1-100, default: 95)
         progress_callback: Optional callback for progress reporting.
             Called with (progress: float, message: str) where progress is 0.0 to 1.0.
+        use_processes: Whether to decode images in worker processes instead of threads
+        try_use_gpu: Whether to stitch on an OpenCL device if one is available
         
     Returns:
         OrthomosaicResult with information about the created orthomosaic
@@ -92,10 +96,24 @@ def create_orthomosaic(
         progress_callback(0.0, "Starting orthomosaic creation...")
     
     # Load images
-    images = load_images(input_path, parallel=parallel, progress_callback=progress_callback)
+    images = load_images(
+        input_path,
+        parallel=parallel,
+        progress_callback=progress_callback,
+        use_processes=use_processes,
+    )
     
     # Stitch images
-    stitched = stitch_images(images, mode=mode, progress_callback=progress_callback)
+    stitched = stitch_images(
+        images,
+        mode=mode,
+        progress_callback=progress_callback,
+        try_use_gpu=try_use_gpu,
+    )
+    
+    # Release the inputs before saving; refcounting frees them immediately
+    image_count = len(images)
+    del images
     
     if progress_callback:
         progress_callback(0.95, "Saving output...")
@@ -110,7 +128,7 @@ def create_orthomosaic(
     height, width = stitched.shape[:2]
     result = OrthomosaicResult(
         output_path=output_path_obj,
-        image_count=len(images),
+        image_count=image_count,
         size=(width, height)
     )
     
@@ -2,22 +2,158 @@
 
 from __future__ import annotations
 
-import base64
 import html
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
-
-import cv2
-import numpy as np
+from typing import Any, Optional
 
+from autoflight._opencv import cv2, np
 from autoflight.exceptions import OutputError, ValidationError
 
 logger = logging.getLogger(__name__)
 
 # Export public API
-__all__ = ["save_image", "save_html"]
+__all__ = ["save_image", "save_html", "encode_png"]
+
+# TIFF outputs above this size are written tile by tile with tifffile
+_TILED_TIFF_MIN_BYTES = 512 * 1024 * 1024
+
+# Tile edge in pixels for tiled TIFF output
+_TIFF_TILE_SIZE = 512
+
+# PNG bytes base64-encoded per write in save_html (must be a multiple of 3)
+_BASE64_CHUNK_BYTES = 3 * 256 * 1024
+
+# Formats save_html can embed: (imencode extension, MIME subtype)
+_HTML_IMAGE_FORMATS = {"png": (".png", b"png"), "jpeg": (".jpg", b"jpeg")}
+
+# save_html document, split around the base64 image payload. Kept as bytes so
+# the file is written without building (and re-encoding) one large str.
+_HTML_HEAD = b"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>%(title)b</title>
+  <style>
+    body {
+      font-family: Arial, sans-serif;
+      margin: 0;
+      padding: 20px;
+      background: #f5f5f5;
+    }
+    h1 {
+      color: #333;
+    }
+    .meta {
+      color: #666;
+      margin-bottom: 16px;
+      font-size: 0.9em;
+    }
+    .image-container {
+      max-width: 100%%;
+      overflow: auto;
+    }
+    img {
+      max-width: 100%%;
+      height: auto;
+      border: 1px solid #ccc;
+      border-radius: 4px;
+    }
+  </style>
+</head>
+<body>
+  <h1>%(title)b</h1>
+  <p class="meta">
+    Size: %(width)b&times;%(height)b pixels &bull; Generated: %(timestamp)b
+  </p>
+  <div class="image-container">
+    <img src="data:image/%(mime)b;base64,"""
+_HTML_TAIL = b"""" alt="%(title)b">
+  </div>
+</body>
+</html>
+"""
+
+
+def _save_tiled_tiff(image: np.ndarray, output_path: Path) -> bool:
+    """Stream a large image to a tiled BigTIFF with tifffile.
+    
+    tifffile is an optional dependency; without it (or for channel layouts
+    it cannot map from BGR) this returns False and OpenCV writes the file.
+    
+    Args:
+        image: Grayscale or 3-channel BGR image
+        output_path: Destination .tif/.tiff path
+        
+    Returns:
+        True if the image was written, False to fall back to OpenCV
+        
+    Raises:
+        OutputError: If writing fails
+    """
+    if image.ndim == 2:
+        data, photometric = image, "minisblack"
+    elif image.ndim == 3 and image.shape[2] == 3:
+        # A reversed-channel view; tifffile copies one tile at a time
+        data, photometric = image[..., ::-1], "rgb"
+    else:
+        return False
+    
+    try:
+        import tifffile  # type: ignore[import-not-found]
+    except ImportError:
+        logger.debug("tifffile not installed, writing TIFF with OpenCV")
+        return False
+    
+    logger.debug(f"Writing tiled TIFF ({image.nbytes / (1024 * 1024):.0f} MB)")
+    try:
+        tifffile.imwrite(
+            str(output_path),
+            data,
+            photometric=photometric,
+            tile=(_TIFF_TILE_SIZE, _TIFF_TILE_SIZE),
+            compression="zlib",
+            bigtiff=True,
+        )
+    except Exception as e:
+        raise OutputError(f"Failed to write tiled TIFF to {output_path}: {e}") from e
+    return True
+
+
+def encode_png(image: np.ndarray, png_compression: int = 3) -> bytes:
+    """Encode an image as PNG once, for reuse by several writers.
+    
+    Pass the result as ``precomputed_png`` to :func:`save_image` (for a
+    ``.png`` or ``.html`` target) and :func:`save_html` so a mosaic written
+    both as a PNG file and an HTML report is only deflated once.
+    
+    Args:
+        image: Image to encode
+        png_compression: PNG compression level (0-9, default: 3)
+        
+    Returns:
+        The encoded PNG file contents
+        
+    Raises:
+        OutputError: If encoding fails
+        ValidationError: If image or parameters are invalid
+    """
+    if image is None or image.size == 0:
+        raise ValidationError("Cannot encode empty or None image")
+    if not 0 <= png_compression <= 9:
+        raise ValidationError(f"PNG compression must be 0-9, got {png_compression}")
+    
+    try:
+        success, buffer = cv2.imencode(
+            ".png", np.ascontiguousarray(image), [cv2.IMWRITE_PNG_COMPRESSION, png_compression]
+        )
+    except cv2.error as e:
+        raise OutputError(f"OpenCV error encoding image: {e}") from e
+    if not success:
+        raise OutputError("Failed to encode image as PNG")
+    return buffer.tobytes()
 
 
 def save_image(
@@ -26,20 +162,34 @@ def save_image(
     create_dirs: bool = True,
     quality: int = 95,
     png_compression: int = 3,
+    optimize: bool = True,
+    precomputed_png: Optional[bytes] = None,
 ) -> None:
     """Save an image to disk with configurable quality settings.
     
+    TIFF outputs larger than 512 MB are streamed to disk as a tiled BigTIFF
+    when tifffile is installed.
+    
     Args:
         image: Image to save
         output_path: Path where to save the image
         create_dirs: Whether to create parent directories if they don't exist
         quality: JPEG quality setting (1-100, default: 95). Higher = better quality, larger file.
         png_compression: PNG compression level (0-9, default: 3). Higher = smaller file, slower.
+        optimize: Whether to optimize JPEG Huffman tables (smaller file, slightly slower)
+        precomputed_png: PNG encoding of ``image`` from :func:`encode_png`, written
+            as-is for ``.png`` and ``.html`` targets instead of re-encoding
         
     Raises:
         OutputError: If saving fails
         ValidationError: If image or parameters are invalid
     """
+    # Delegate to HTML output when the output extension is .html; save_html
+    # does its own validation and directory creation
+    if output_path.suffix.lower() == ".html":
+        save_html(image, output_path, create_dirs=create_dirs, precomputed_png=precomputed_png)
+        return
+    
     # Validate image
     if image is None or image.size == 0:
         raise ValidationError("Cannot save empty or None image")
@@ -59,11 +209,6 @@ def save_image(
     elif not output_path.parent.exists():
         raise ValidationError(f"Output directory does not exist: {output_path.parent}")
     
-    # Delegate to HTML output when the output extension is .html
-    if output_path.suffix.lower() == ".html":
-        save_html(image, output_path, create_dirs=create_dirs)
-        return
-
     logger.info(f"Saving image to {output_path}")
     
     # Determine output format and set appropriate parameters
@@ -71,11 +216,37 @@ def save_image(
     params = []
     
     if suffix in {".jpg", ".jpeg"}:
-        params = [cv2.IMWRITE_JPEG_QUALITY, quality]
-        logger.debug(f"Using JPEG quality: {quality}")
+        # Chroma is encoded slightly below luma quality; the eye is far less
+        # sensitive to it and it makes up much of the file size
+        chroma_quality = min(quality, max(quality - 10, 60))
+        params = [
+            cv2.IMWRITE_JPEG_QUALITY, quality,
+            cv2.IMWRITE_JPEG_CHROMA_QUALITY, chroma_quality,
+            cv2.IMWRITE_JPEG_OPTIMIZE, int(optimize),
+        ]
+        logger.debug(
+            f"Using JPEG quality: {quality} (chroma {chroma_quality}, optimize={optimize})"
+        )
     elif suffix == ".png":
+        if precomputed_png is not None:
+            try:
+                output_path.write_bytes(precomputed_png)
+            except OSError as e:
+                raise OutputError(f"Failed to write output image to {output_path}: {e}") from e
+            logger.debug(f"Image saved successfully: {output_path}")
+            return
         params = [cv2.IMWRITE_PNG_COMPRESSION, png_compression]
         logger.debug(f"Using PNG compression: {png_compression}")
+    elif suffix in {".tif", ".tiff"} and image.nbytes > _TILED_TIFF_MIN_BYTES:
+        # Avoid holding a full encoded copy of very large mosaics in memory
+        if _save_tiled_tiff(image, output_path):
+            logger.debug(f"Image saved successfully: {output_path}")
+            return
+    
+    # Copy a strided view once here rather than inside every OpenCV call
+    if not image.flags["C_CONTIGUOUS"]:
+        logger.debug("Output image is not C-contiguous, copying before encoding")
+        image = np.ascontiguousarray(image)
     
     # Save the image
     try:
@@ -93,18 +264,26 @@ def save_html(
     output_path: Path,
     create_dirs: bool = True,
     title: str = "Orthomosaic",
+    image_format: str = "png",
+    quality: int = 95,
+    precomputed_png: Optional[bytes] = None,
 ) -> None:
     """Save an image as an HTML document with the image embedded as base64.
 
     The generated HTML file is self-contained: the orthomosaic is encoded as a
-    base64 PNG data URL so the file can be opened in any browser without
-    additional assets.
+    base64 data URL so the file can be opened in any browser without
+    additional assets. PNG is lossless; JPEG encodes several times faster
+    and is much smaller for photographic mosaics.
 
     Args:
         image: Image to embed
         output_path: Path where to save the HTML file (should end with .html)
         create_dirs: Whether to create parent directories if they don't exist
         title: Title displayed in the HTML document
+        image_format: Embedded image format ("png" or "jpeg")
+        quality: JPEG quality setting (1-100) when image_format is "jpeg"
+        precomputed_png: PNG encoding of ``image`` from :func:`encode_png`,
+            embedded as-is when image_format is "png"
 
     Raises:
         OutputError: If saving fails
@@ -113,6 +292,11 @@ def save_html(
     if image is None or image.size == 0:
         raise ValidationError("Cannot save empty or None image")
 
+    if image_format not in _HTML_IMAGE_FORMATS:
+        raise ValidationError(f"Invalid HTML image format: {image_format}. Use 'png' or 'jpeg'")
+    if not 1 <= quality <= 100:
+        raise ValidationError(f"JPEG quality must be 1-100, got {quality}")
+
     if create_dirs:
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -123,68 +307,57 @@ def save_html(
 
     logger.info(f"Saving HTML report to {output_path}")
 
-    # Encode image as PNG into memory, then base64-encode it
-    try:
-        success, buffer = cv2.imencode(".png", image)
-        if not success:
-            raise OutputError("Failed to encode image for HTML output")
-        img_b64 = base64.b64encode(buffer).decode("ascii")
-    except cv2.error as e:
-        raise OutputError(f"OpenCV error encoding image: {e}") from e
+    # Encode image into memory (unless the caller already has the PNG);
+    # base64 is streamed to the file below
+    extension, mime = _HTML_IMAGE_FORMATS[image_format]
+    buffer: Any = precomputed_png if image_format == "png" else None
+    if buffer is None:
+        if image_format == "jpeg":
+            params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        else:
+            # Fast zlib level with the default filter strategy: higher levels
+            # barely shrink photographic content but cost far more CPU
+            params = [
+                cv2.IMWRITE_PNG_COMPRESSION, 1,
+                cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_DEFAULT,
+            ]
+        if not image.flags["C_CONTIGUOUS"]:
+            logger.debug("Output image is not C-contiguous, copying before encoding")
+            image = np.ascontiguousarray(image)
+        try:
+            success, buffer = cv2.imencode(extension, image, params)
+            if not success:
+                raise OutputError("Failed to encode image for HTML output")
+        except cv2.error as e:
+            raise OutputError(f"OpenCV error encoding image: {e}") from e
 
+    # Only the title is user-supplied; the numbers and the fixed-format
+    # timestamp cannot contain markup and need no escaping
     height, width = image.shape[:2]
-    safe_title = html.escape(title)
-    timestamp = html.escape(datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"))
-    safe_width = html.escape(str(width))
-    safe_height = html.escape(str(height))
+    timestamp = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    fields = {
+        b"title": html.escape(title).encode("utf-8"),
+        b"width": b"%d" % width,
+        b"height": b"%d" % height,
+        b"timestamp": timestamp.encode("ascii"),
+        b"mime": mime,
+    }
 
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{safe_title}</title>
-  <style>
-    body {{
-      font-family: Arial, sans-serif;
-      margin: 0;
-      padding: 20px;
-      background: #f5f5f5;
-    }}
-    h1 {{
-      color: #333;
-    }}
-    .meta {{
-      color: #666;
-      margin-bottom: 16px;
-      font-size: 0.9em;
-    }}
-    .image-container {{
-      max-width: 100%;
-      overflow: auto;
-    }}
-    img {{
-      max-width: 100%;
-      height: auto;
-      border: 1px solid #ccc;
-      border-radius: 4px;
-    }}
-  </style>
-</head>
-<body>
-  <h1>{safe_title}</h1>
-  <p class="meta">
-    Size: {safe_width}&times;{safe_height} pixels &bull; Generated: {timestamp}
-  </p>
-  <div class="image-container">
-    <img src="data:image/png;base64,{img_b64}" alt="{safe_title}">
-  </div>
-</body>
-</html>
-"""
+    # pybase64 (optional) has a SIMD encoder with the same output
+    try:
+        from pybase64 import b64encode  # type: ignore[import-not-found]
+    except ImportError:
+        from base64 import b64encode
 
+    # Encode in slices (a multiple of 3 bytes, so no padding mid-stream)
+    # rather than building the whole base64 string in memory
+    png = memoryview(buffer).cast("B")
     try:
-        output_path.write_text(html_content, encoding="utf-8")
+        with open(output_path, "wb") as f:
+            f.write(_HTML_HEAD % fields)
+            for start in range(0, len(png), _BASE64_CHUNK_BYTES):
+                f.write(b64encode(png[start:start + _BASE64_CHUNK_BYTES]))
+            f.write(_HTML_TAIL % fields)
     except OSError as e:
         raise OutputError(f"Failed to write HTML file: {e}") from e
 
@@ -8,8 +8,10 @@ large files, and malformed input.
 from __future__ import annotations
 
 import logging
+import os
+import stat
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 from autoflight.exceptions import SecurityError, ValidationError
 
@@ -58,6 +60,7 @@ def validate_file_size(
     path: Path,
     max_size: Optional[int] = None,
     limits: Optional[SecurityLimits] = None,
+    file_size: Optional[int] = None,
 ) -> None:
     """Validate that a file does not exceed size limits.
     
@@ -65,6 +68,7 @@ def validate_file_size(
         path: Path to the file to validate
         max_size: Maximum allowed file size in bytes (overrides limits)
         limits: SecurityLimits instance (defaults to global limits)
+        file_size: Size of the file if the caller has already stat()ed it
         
     Raises:
         SecurityError: If file size exceeds the limit
@@ -75,10 +79,11 @@ def validate_file_size(
     
     effective_max = max_size if max_size is not None else limits.max_file_size
     
-    try:
-        file_size = path.stat().st_size
-    except OSError as e:
-        raise ValidationError(f"Cannot access file: {path}") from e
+    if file_size is None:
+        try:
+            file_size = path.stat().st_size
+        except OSError as e:
+            raise ValidationError(f"Cannot access file: {path}") from e
     
     if file_size > effective_max:
         raise SecurityError(
@@ -153,7 +158,7 @@ def validate_path_security(path: Path, base_dir: Optional[Path] = None) -> Path:
     
     This function checks for:
     - Path traversal attempts (e.g., ../../../etc/passwd)
-    - Symbolic link attacks
+    - Symbolic link attacks (the path itself may not be a symlink)
     - Invalid paths
     
     Args:
@@ -166,15 +171,150 @@ def validate_path_security(path: Path, base_dir: Optional[Path] = None) -> Path:
     Raises:
         SecurityError: If path validation fails
     """
+    base_resolved = _resolve_base_dir(base_dir) if base_dir is not None else None
+    return _validate_resolved(path, base_dir, base_resolved)[0]
+
+
+def validate_paths(paths: Iterable[Path], base_dir: Optional[Path] = None) -> List[Path]:
+    """Validate many paths against the same base directory.
+    
+    Equivalent to calling :func:`validate_path_security` on each path, but
+    the base directory is resolved once for the whole batch and repeated
+    paths are resolved only once.
+    
+    Args:
+        paths: Paths to validate
+        base_dir: Optional base directory - if provided, resolved paths must be within it
+        
+    Returns:
+        Resolved, validated paths in input order
+        
+    Raises:
+        SecurityError: If any path fails validation
+    """
+    base_resolved = _resolve_base_dir(base_dir) if base_dir is not None else None
+    
+    # Scoped to this call: a process-wide cache could hand out a stale
+    # result after a symlink on disk is swapped
+    resolved_by_path: Dict[str, Path] = {}
+    results = []
+    for path in paths:
+        key = os.fspath(path)
+        resolved = resolved_by_path.get(key)
+        if resolved is None:
+            resolved = _validate_resolved(path, base_dir, base_resolved)[0]
+            resolved_by_path[key] = resolved
+        results.append(resolved)
+    return results
+
+
+class PathValidator:
+    """Validate many paths against one base directory.
+    
+    The base directory is resolved once, when the validator is created, and
+    containment is checked by comparing resolved path strings instead of
+    ``Path.relative_to`` (which signals failure by raising). Use this when a
+    long-lived component validates paths against the same base repeatedly;
+    the checks are the same as :func:`validate_path_security`.
+    
+    Example:
+        >>> validator = PathValidator(Path("/data/images"))
+        >>> validator.validate(Path("/data/images/a.jpg"))
+    """
+    
+    def __init__(self, base_dir: Path) -> None:
+        """Resolve the base directory.
+        
+        Args:
+            base_dir: Directory that validated paths must resolve inside
+            
+        Raises:
+            SecurityError: If the base directory cannot be resolved
+        """
+        self.base_dir = base_dir
+        base = os.path.normcase(str(_resolve_base_dir(base_dir)))
+        self._base = base
+        # os.path.join adds exactly one trailing separator (none for the root)
+        self._base_prefix = os.path.join(base, "")
+    
+    def validate(self, path: Path) -> Path:
+        """Validate a path and return it resolved.
+        
+        Args:
+            path: Path to validate
+            
+        Returns:
+            Resolved, validated path
+            
+        Raises:
+            SecurityError: If the path is a symbolic link, is invalid, or
+                resolves outside of the base directory
+        """
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            st = None
+        except (OSError, ValueError) as e:
+            raise SecurityError(f"Invalid path: {path}") from e
+        
+        if st is not None and stat.S_ISLNK(st.st_mode):
+            raise SecurityError(f"Symbolic links are not allowed: {path}")
+        
+        try:
+            resolved = os.path.realpath(path)
+        except (OSError, ValueError) as e:
+            raise SecurityError(f"Invalid path: {path}") from e
+        
+        key = os.path.normcase(resolved)
+        if key != self._base and not key.startswith(self._base_prefix):
+            raise SecurityError(
+                f"Path traversal detected: {path} resolves outside of {self.base_dir}"
+            )
+        
+        logger.debug(f"Path security validated: {path} -> {resolved}")
+        return Path(resolved)
+
+
+def _resolve_base_dir(base_dir: Path) -> Path:
+    """Resolve a base directory for containment checks."""
+    try:
+        return base_dir.resolve()
+    except (OSError, RuntimeError) as e:
+        raise SecurityError(f"Invalid base directory: {base_dir}") from e
+
+
+def _validate_resolved(
+    path: Path,
+    base_dir: Optional[Path],
+    base_resolved: Optional[Path],
+) -> Tuple[Path, Optional[os.stat_result]]:
+    """Check ``path`` and resolve it against an already-resolved base.
+    
+    Returns:
+        The resolved path and the ``lstat`` result of the original path
+        (None if it does not exist)
+    """
+    # lstat the path as given first: resolving would follow the link and
+    # lose the evidence needed to reject it
+    st: Optional[os.stat_result]
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        st = None
+    except (OSError, ValueError) as e:
+        raise SecurityError(f"Invalid path: {path}") from e
+    
+    if st is not None and stat.S_ISLNK(st.st_mode):
+        raise SecurityError(f"Symbolic links are not allowed: {path}")
+    
     try:
         resolved = path.resolve()
     except (OSError, RuntimeError) as e:
         raise SecurityError(f"Invalid path: {path}") from e
     
     # Check for path traversal if base_dir is provided
-    if base_dir is not None:
+    if base_resolved is not None:
         try:
-            base_resolved = base_dir.resolve()
             # Check that resolved path starts with base directory
             resolved.relative_to(base_resolved)
         except ValueError:
@@ -183,18 +323,123 @@ def validate_path_security(path: Path, base_dir: Optional[Path] = None) -> Path:
             )
     
     logger.debug(f"Path security validated: {path} -> {resolved}")
-    return resolved
+    return resolved, st
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# JPEG start-of-frame markers (SOF0-SOF15 minus DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# TIFF field types that can hold ImageWidth/ImageLength: SHORT and LONG
+_TIFF_SHORT = 3
+_TIFF_LONG = 4
+
+
+def _read_image_dimensions(path: Path) -> Optional[Tuple[int, int]]:
+    """Read ``(width, height)`` from a PNG, JPEG or TIFF header.
+    
+    Only the header (for JPEG, the segments before the frame header) is
+    read, so the cost does not grow with the pixel count.
+    
+    Returns:
+        Image dimensions, or None if the format is not recognised or the
+        header cannot be parsed
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(24)
+            if head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+                return int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+            if head.startswith(b"\xff\xd8"):
+                return _jpeg_dimensions(f)
+            if head[:4] in (b"II*\x00", b"MM\x00*"):
+                return _tiff_dimensions(f, "little" if head[:2] == b"II" else "big")
+    except OSError:
+        return None
+    return None
+
+
+def _jpeg_dimensions(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    """Walk JPEG marker segments up to the start-of-frame header."""
+    f.seek(2)
+    while True:
+        if f.read(1) != b"\xff":
+            return None
+        marker = f.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0x01 or 0xD0 <= code <= 0xD8:  # no length field
+            continue
+        if code in (0xD9, 0xDA):  # end of image / start of scan
+            return None
+        length = int.from_bytes(f.read(2), "big")
+        if length < 2:
+            return None
+        if code in _JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            return int.from_bytes(frame[3:5], "big"), int.from_bytes(frame[1:3], "big")
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _tiff_dimensions(f: BinaryIO, order: Literal["little", "big"]) -> Optional[Tuple[int, int]]:
+    """Read ImageWidth and ImageLength from the first TIFF IFD."""
+    f.seek(4)
+    f.seek(int.from_bytes(f.read(4), order))
+    count = int.from_bytes(f.read(2), order)
+    entries = f.read(12 * count)
+    values: Dict[int, int] = {}
+    for i in range(0, len(entries) - 11, 12):
+        tag = int.from_bytes(entries[i:i + 2], order)
+        if tag in (256, 257):
+            kind = int.from_bytes(entries[i + 2:i + 4], order)
+            if kind == _TIFF_SHORT:
+                values[tag] = int.from_bytes(entries[i + 8:i + 10], order)
+            elif kind == _TIFF_LONG:
+                values[tag] = int.from_bytes(entries[i + 8:i + 12], order)
+    if 256 in values and 257 in values:
+        return values[256], values[257]
+    return None
+
+
+def _decode_image_dimensions(path: Path) -> Optional[Tuple[int, int]]:
+    """Decode an image with OpenCV to find its dimensions (slow fallback)."""
+    try:
+        from autoflight._opencv import cv2
+    except ImportError:
+        logger.warning("OpenCV not available for dimension check")
+        return None
+    
+    try:
+        image = cv2.imread(str(path))
+    except Exception as e:
+        logger.warning(f"Could not check image dimensions: {e}")
+        return None
+    if image is None:
+        logger.warning(f"Could not check image dimensions: cannot decode {path}")
+        return None
+    height, width = image.shape[:2]
+    return width, height
 
 
 def validate_image_file(
-    path: Path,
+    path: Union[Path, os.DirEntry],
     limits: Optional[SecurityLimits] = None,
     check_dimensions: bool = False,
 ) -> None:
     """Perform comprehensive security validation on an image file.
     
+    Given an ``os.DirEntry`` from ``os.scandir``, the symlink check uses the
+    file type already read with the directory listing and the size comes
+    from the entry's own ``lstat``, so no path resolution is needed.
+    
     Args:
-        path: Path to the image file
+        path: Path to the image file, or a directory entry for it
         limits: SecurityLimits instance (defaults to global limits)
         check_dimensions: Whether to load and check image dimensions
         
@@ -206,22 +451,79 @@ def validate_image_file(
         limits = _default_limits
     
     # Validate path security
-    validate_path_security(path)
+    st: Optional[os.stat_result]
+    if isinstance(path, os.DirEntry):
+        entry = path
+        path = Path(entry.path)
+        if entry.is_symlink():
+            raise SecurityError(f"Symbolic links are not allowed: {path}")
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError as e:
+            raise ValidationError(f"Cannot access file: {path}") from e
+    else:
+        _, st = _validate_resolved(path, None, None)
     
-    # Validate file size
-    validate_file_size(path, limits=limits)
+    # Validate file size, reusing the lstat from the path check (the path
+    # is known not to be a symlink, so it describes the file itself)
+    validate_file_size(path, limits=limits, file_size=st.st_size if st is not None else None)
     
-    # Optionally check image dimensions (requires loading the image)
+    # Optionally check image dimensions, from the file header when the
+    # format is recognised and by decoding the image otherwise
     if check_dimensions:
-        try:
-            import cv2
-            image = cv2.imread(str(path))
-            if image is not None:
-                height, width = image.shape[:2]
-                validate_image_dimensions(width, height, limits=limits)
-        except ImportError:
-            logger.warning("OpenCV not available for dimension check")
-        except Exception as e:
-            logger.warning(f"Could not check image dimensions: {e}")
+        size = _read_image_dimensions(path)
+        if size is None:
+            size = _decode_image_dimensions(path)
+        if size is not None:
+            validate_image_dimensions(size[0], size[1], limits=limits)
     
     logger.debug(f"Image file security validated: {path}")
+
+
+def validate_image_directory(
+    dir_path: Path,
+    limits: Optional[SecurityLimits] = None,
+    check_dimensions: bool = False,
+    extensions: Optional[Iterable[str]] = None,
+) -> List[Path]:
+    """Validate every image file directly inside a directory.
+    
+    The directory is listed once with ``os.scandir`` and each entry is passed
+    to :func:`validate_image_file`, which reuses the file type and metadata
+    from the listing. Subdirectories are skipped.
+    
+    Args:
+        dir_path: Directory containing the images
+        limits: SecurityLimits instance (defaults to global limits)
+        check_dimensions: Whether to load and check image dimensions
+        extensions: Optional lowercase suffixes (e.g. ``".jpg"``) to restrict
+            validation to; other files are ignored
+        
+    Returns:
+        Paths of the validated files, sorted by name
+        
+    Raises:
+        SecurityError: If the file count or any file fails validation
+        ValidationError: If the directory cannot be read
+    """
+    if limits is None:
+        limits = _default_limits
+    
+    suffixes = tuple(extensions) if extensions is not None else None
+    try:
+        with os.scandir(dir_path) as it:
+            entries = [
+                entry for entry in it
+                if not entry.is_dir(follow_symlinks=False)
+                and (suffixes is None or entry.name.lower().endswith(suffixes))
+            ]
+    except OSError as e:
+        raise ValidationError(f"Cannot read directory: {dir_path}") from e
+    
+    validate_file_count(len(entries), limits=limits)
+    
+    entries.sort(key=lambda entry: entry.name)
+    for entry in entries:
+        validate_image_file(entry, limits=limits, check_dimensions=check_dimensions)
+    
+    return [Path(entry.path) for entry in entries]
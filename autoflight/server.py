@@ -18,29 +18,204 @@ Or via the CLI::
 from __future__ import annotations
 
 import base64
+import email.policy
+import gzip
 import json
 import logging
+import os
+import socket
 import threading
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from email.parser import BytesHeaderParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
 
-import cv2
-import numpy as np
-
-from autoflight.exceptions import AutoflightError
+from autoflight._opencv import cv2, np
+from autoflight.exceptions import AutoflightError, SecurityError
+from autoflight.security import get_default_limits, validate_file_count
 from autoflight.stitcher import stitch_images
 
+# pybase64 (optional, the ``html`` extra) decodes with SIMD; same semantics
+try:
+    from pybase64 import b64decode as _b64decode  # type: ignore[import-not-found]
+except ImportError:
+    from base64 import b64decode as _b64decode
+
+# orjson (optional, the ``server`` extra) parses and serialises the
+# multi-megabyte base64 strings much faster than the stdlib codec
+_json_dumps: Callable[[Any], bytes]
+_json_loads: Callable[[bytes | bytearray | str], Any]
+try:
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:
+    def _stdlib_json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_dumps = _stdlib_json_dumps
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 _WEB_DIR = Path(__file__).parent / "web"
 
+
+def _load_index_html() -> tuple[bytes | None, bytes | None]:
+    """Read the packaged web app and its gzip-compressed form, if present."""
+    try:
+        html = (_WEB_DIR / "index.html").read_bytes()
+    except OSError:
+        return None, None
+    return html, gzip.compress(html, mtime=0)
+
+
+# The page is static, so it is read (and compressed) once per process
+_INDEX_HTML, _INDEX_HTML_GZIP = _load_index_html()
+
 __all__ = ["run_server"]
 
+# Largest request body /api/stitch accepts, independent of the file limits
+DEFAULT_MAX_REQUEST_SIZE = 512 * 1024 * 1024  # 512 MiB
+
+# Request bodies are read in pieces of this size, so memory is only taken
+# up as data actually arrives
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+# Parses the (small) header block of each multipart part
+_HEADER_PARSER = BytesHeaderParser(policy=email.policy.HTTP)
+
+# Shared by all request threads for decoding uploaded images
+_DECODE_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="autoflight-upload"
+)
+
+
+def _estimated_upload_size(upload: str | bytes | memoryview) -> int:
+    """Return the decoded byte length of an upload without decoding it."""
+    if not isinstance(upload, str):
+        return len(upload)
+    # Skip any "data:<mime>;base64," prefix without slicing the string
+    start = upload.find(",") + 1
+    padding = 2 if upload.endswith("==") else 1 if upload.endswith("=") else 0
+    return max(len(upload) - start - padding, 0) * 3 // 4
+
+
+def _decode_upload(upload: str | bytes | memoryview) -> np.ndarray | None:
+    """Decode one uploaded image given as raw file bytes, a data URL or raw base64.
+
+    Returns ``None`` if the bytes are not a readable image.
+    """
+    if isinstance(upload, str):
+        # Encode once and decode from a view past any data URL prefix, rather
+        # than slicing the (multi-megabyte) string and copying it again
+        encoded = upload.encode("ascii")
+        data = _b64decode(memoryview(encoded)[encoded.find(b",") + 1:])
+    else:
+        data = upload
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def _ends_delimiter(body: bytes | bytearray, offset: int) -> bool:
+    """Whether a boundary match ending at *offset* is a complete delimiter line.
+
+    A delimiter is followed by ``--`` (the last one), or by optional
+    whitespace and a line break; anything else is part content that merely
+    starts with the boundary string.
+    """
+    tail = body[offset:offset + 2]
+    return tail == b"--" or tail[:1] in (b"\r", b" ", b"\t")
+
+
+def _find_delimiter(body: bytes | bytearray, delimiter: bytes, start: int) -> int:
+    """Return the offset of the next multipart *delimiter* in *body*, or -1."""
+    while True:
+        found = body.find(delimiter, start)
+        if found < 0 or _ends_delimiter(body, found + len(delimiter)):
+            return found
+        start = found + 1
+
+
+def _parse_multipart(
+    content_type: str, body: bytes | bytearray
+) -> tuple[list[memoryview], dict[str, str]]:
+    """Split a ``multipart/form-data`` body into file parts and text fields.
+
+    Part boundaries are located with ``bytes.find`` and file contents are
+    returned as memoryviews into *body*, so no image data is copied. File
+    parts (those with a filename, or named ``images``) are returned in request
+    order; other parts are decoded as text by field name.
+
+    Raises:
+        ValueError: If the body is not a well-formed multipart message.
+    """
+    header = Message()
+    header["Content-Type"] = content_type
+    boundary = header.get_boundary()
+    if not boundary:
+        raise ValueError("multipart/form-data body has no boundary")
+    delimiter = b"\r\n--" + boundary.encode("latin-1")
+
+    view = memoryview(body)
+    files: list[memoryview] = []
+    fields: dict[str, str] = {}
+    # The first delimiter may start the body, without a preceding line break
+    if body.startswith(delimiter[2:]) and _ends_delimiter(body, len(delimiter) - 2):
+        pos = len(delimiter) - 2
+    else:
+        found = _find_delimiter(body, delimiter, 0)
+        if found < 0:
+            raise ValueError("malformed multipart/form-data body")
+        pos = found + len(delimiter)
+    while not body.startswith(b"--", pos):
+        line_end = body.find(b"\r\n", pos)
+        if line_end < 0:
+            raise ValueError("malformed multipart/form-data body")
+        start = line_end + 2
+        end = _find_delimiter(body, delimiter, start)
+        if end < 0:
+            raise ValueError("unterminated multipart/form-data part")
+        if body.startswith(b"\r\n", start):
+            headers_end, content_start = start, start + 2
+        else:
+            headers_end = body.find(b"\r\n\r\n", start, end)
+            if headers_end < 0:
+                raise ValueError("malformed multipart/form-data part headers")
+            content_start = headers_end + 4
+        part = _HEADER_PARSER.parsebytes(bytes(view[start:headers_end]))
+        content = view[content_start:end]
+        name = part.get_param("name", header="content-disposition")
+        if part.get_filename() is not None or name == "images":
+            files.append(content)
+        elif isinstance(name, str):
+            charset = part.get_content_charset() or "utf-8"
+            try:
+                fields[name] = str(content, charset)
+            except LookupError as exc:
+                raise ValueError(f"unknown charset {charset!r} in field {name!r}") from exc
+        pos = end + len(delimiter)
+    return files, fields
+
 
 class _AutoflightHandler(BaseHTTPRequestHandler):
     """HTTP request handler for the autoflight web interface."""
 
+    # Keep connections open between requests; every response carries a
+    # Content-Length, and paths that leave a request body unread close
+    protocol_version = "HTTP/1.1"
+
+    # Close connections that stay idle this long (seconds), so quiet
+    # keep-alive clients cannot hold server threads indefinitely
+    timeout = 60
+
+    # Send small responses (errors, CORS pre-flights) immediately instead of
+    # letting Nagle's algorithm hold them back waiting for an ACK
+    disable_nagle_algorithm = True
+
     # ── Logging ──────────────────────────────────────────────────────────────
 
     def log_message(self, format: str, *args: object) -> None:  # type: ignore[override]
@@ -48,19 +223,28 @@ class _AutoflightHandler(BaseHTTPRequestHandler):
 
     # ── Response helpers ──────────────────────────────────────────────────────
 
-    def _send_bytes(self, body: bytes, content_type: str, status: int = 200) -> None:
+    def _send_bytes(
+        self,
+        body: bytes,
+        content_type: str,
+        status: int = 200,
+        headers: dict | None = None,
+    ) -> None:
         self.send_response(status)
         self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(body)
 
-    def _send_json(self, obj: dict, status: int = 200) -> None:
+    def _send_json(self, obj: dict, status: int = 200, headers: dict | None = None) -> None:
         self._send_bytes(
-            json.dumps(obj).encode("utf-8"),
+            _json_dumps(obj),
             "application/json; charset=utf-8",
             status,
+            headers,
         )
 
     # ── CORS pre-flight ───────────────────────────────────────────────────────
@@ -74,63 +258,167 @@ class _AutoflightHandler(BaseHTTPRequestHandler):
 
     # ── GET: serve the web app ────────────────────────────────────────────────
 
+    def _accepts_gzip(self) -> bool:
+        """Whether the client's Accept-Encoding allows a gzip response."""
+        for coding in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = coding.partition(";")
+            if name.strip().lower() == "gzip":
+                _, _, quality = params.partition("q=")
+                try:
+                    return not quality.strip() or float(quality) > 0
+                except ValueError:
+                    return False
+        return False
+
     def do_GET(self) -> None:  # noqa: N802
         if self.path in ("/", "/index.html"):
-            html_path = _WEB_DIR / "index.html"
-            if html_path.exists():
-                self._send_bytes(html_path.read_bytes(), "text/html; charset=utf-8")
-            else:
+            if _INDEX_HTML is None or _INDEX_HTML_GZIP is None:
                 self._send_json({"error": "Web interface not found"}, 404)
+            elif self._accepts_gzip():
+                self._send_bytes(
+                    _INDEX_HTML_GZIP,
+                    "text/html; charset=utf-8",
+                    headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+                )
+            else:
+                self._send_bytes(
+                    _INDEX_HTML, "text/html; charset=utf-8", headers={"Vary": "Accept-Encoding"}
+                )
         else:
             self._send_json({"error": "Not found"}, 404)
 
     # ── POST: API ─────────────────────────────────────────────────────────────
 
     def do_POST(self) -> None:  # noqa: N802
-        if self.path == "/api/stitch":
+        if urlsplit(self.path).path == "/api/stitch":
             self._handle_stitch()
         else:
-            self._send_json({"error": "Not found"}, 404)
+            # The request body is not read, so the connection cannot be reused
+            self._send_json({"error": "Not found"}, 404, {"Connection": "close"})
+
+    def _wants_binary(self) -> bool:
+        """Whether the client asked for the raw PNG instead of a JSON envelope."""
+        query = parse_qs(urlsplit(self.path).query)
+        if query.get("format") == ["binary"]:
+            return True
+        accept = self.headers.get("Accept", "")
+        return "image/png" in accept and "application/json" not in accept
+
+    def _read_body(self, length: int) -> bytearray:
+        """Read exactly *length* body bytes into a single buffer.
+
+        The buffer grows with the bytes received rather than being allocated
+        from the Content-Length up front, so a client that announces a large
+        body without sending it cannot make the server reserve the memory.
+
+        Raises:
+            ConnectionError: If the client closes before sending *length* bytes.
+        """
+        body = bytearray()
+        while len(body) < length:
+            chunk = self.rfile.read(min(length - len(body), _READ_CHUNK_SIZE))
+            if not chunk:
+                raise ConnectionError(f"expected {length} bytes, got {len(body)}")
+            body += chunk
+        return body
 
     def _handle_stitch(self) -> None:
-        """Decode uploaded images, stitch them, and return a base64 PNG."""
-        # Parse JSON body
+        """Decode uploaded images, stitch them, and return the result as PNG.
+
+        Images arrive either as a JSON body (``{"images": [<base64 or data
+        URL>, ...], "mode": ...}``) or as ``multipart/form-data`` with one
+        file part per image and an optional ``mode`` field; the multipart
+        form skips base64 entirely.
+
+        The PNG is sent as-is (``image/png``, with the size and image count in
+        ``X-Image-*`` headers) when the client sends ``Accept: image/png`` or
+        ``?format=binary``; otherwise it is base64-encoded in a JSON envelope.
+        Errors are always JSON.
+        """
+        limits = get_default_limits()
+
+        # Parse the JSON or multipart body
+        close = {"Connection": "close"}
         try:
             length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(length)
-            payload = json.loads(body)
+        except ValueError as exc:
+            error = f"Invalid request body: {exc}"
+            self._send_json({"success": False, "error": error}, 400, close)
+            return
+        # Reject from the headers alone where possible, without reading the body
+        if length < 0:
+            self._send_json({"success": False, "error": "Invalid Content-Length"}, 400, close)
+            return
+        if length == 0:
+            self._send_json({"success": False, "error": "No images provided"}, 400)
+            return
+        # Base64 inflates by 4/3; anything over twice the limits cannot be valid,
+        # so refuse it before reading (and close, leaving the body unread)
+        max_request_size = getattr(self.server, "max_request_size", DEFAULT_MAX_REQUEST_SIZE)
+        if length > min(max_request_size, limits.max_files * limits.max_file_size * 2):
+            self._send_json({"success": False, "error": "Request body too large"}, 413, close)
+            return
+        content_type = self.headers.get("Content-Type", "")
+        try:
+            body = self._read_body(length)
+        except ConnectionError as exc:
+            error = f"Invalid request body: {exc}"
+            self._send_json({"success": False, "error": error}, 400, close)
+            return
+        try:
+            if content_type.startswith("multipart/form-data"):
+                uploads, fields = _parse_multipart(content_type, body)
+                mode = fields.get("mode", "panorama")
+            else:
+                payload = _json_loads(body)
+                uploads = payload.get("images", [])
+                mode = str(payload.get("mode", "panorama"))
         except (ValueError, json.JSONDecodeError) as exc:
             self._send_json({"success": False, "error": f"Invalid request body: {exc}"}, 400)
             return
+        del body
 
-        images_b64: list = payload.get("images", [])
-        mode: str = str(payload.get("mode", "panorama"))
-
-        if not images_b64:
+        if not uploads:
             self._send_json({"success": False, "error": "No images provided"}, 400)
             return
 
-        # Decode images from base64 data URLs / raw base64
-        images: list = []
-        for i, b64 in enumerate(images_b64):
-            # Strip optional "data:<mime>;base64," prefix
-            if "," in b64:
-                b64 = b64.split(",", 1)[1]
-            try:
-                raw = base64.b64decode(b64)
-                arr = np.frombuffer(raw, dtype=np.uint8)
-                img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-            except Exception as exc:
+        # Enforce the limits on the encoded payload, before decoding anything
+        try:
+            validate_file_count(len(uploads), limits=limits)
+        except SecurityError as exc:
+            self._send_json({"success": False, "error": str(exc)}, 413)
+            return
+        for i, upload in enumerate(uploads):
+            if not isinstance(upload, (str, bytes, memoryview)):
                 self._send_json(
-                    {"success": False, "error": f"Failed to decode image {i + 1}: {exc}"},
-                    400,
+                    {"success": False, "error": f"Image {i + 1} is not a base64 string"}, 400
                 )
                 return
-            if img is None:
-                self._send_json(
-                    {"success": False, "error": f"Could not read image {i + 1}"},
-                    400,
+            size = _estimated_upload_size(upload)
+            if size > limits.max_file_size:
+                error = (
+                    f"Image {i + 1} ({size:,} bytes) exceeds the size limit "
+                    f"({limits.max_file_size:,} bytes)"
                 )
+                self._send_json({"success": False, "error": error}, 413)
+                return
+
+        # Decode the uploads; imdecode releases the GIL, so they are decoded
+        # in parallel
+        futures = [_DECODE_POOL.submit(_decode_upload, upload) for upload in uploads]
+        images: list = []
+        for i, future in enumerate(futures):
+            try:
+                img = future.result()
+            except Exception as exc:
+                img = None
+                error = f"Failed to decode image {i + 1}: {exc}"
+            else:
+                error = f"Could not read image {i + 1}"
+            if img is None:
+                for pending in futures:
+                    pending.cancel()
+                self._send_json({"success": False, "error": error}, 400)
                 return
             images.append(img)
 
@@ -145,14 +433,28 @@ class _AutoflightHandler(BaseHTTPRequestHandler):
             self._send_json({"success": False, "error": f"Stitching error: {exc}"}, 500)
             return
 
-        # Encode result as PNG
-        ok, buf = cv2.imencode(".png", stitched, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+        # Encode result as PNG; level 1 deflates far faster than higher levels
+        # for photographic content at a small size cost
+        ok, buf = cv2.imencode(".png", stitched, [cv2.IMWRITE_PNG_COMPRESSION, 1])
         if not ok:
             self._send_json({"success": False, "error": "Failed to encode result image"}, 500)
             return
 
-        result_b64 = base64.b64encode(buf).decode("ascii")
         height, width = stitched.shape[:2]
+        if self._wants_binary():
+            self._send_bytes(
+                buf.tobytes(),
+                "image/png",
+                headers={
+                    "X-Image-Width": str(width),
+                    "X-Image-Height": str(height),
+                    "X-Image-Count": str(len(images)),
+                    "Access-Control-Expose-Headers": "X-Image-Width, X-Image-Height, X-Image-Count",
+                },
+            )
+            return
+
+        result_b64 = base64.b64encode(buf).decode("ascii")
         self._send_json(
             {
                 "success": True,
@@ -164,10 +466,35 @@ class _AutoflightHandler(BaseHTTPRequestHandler):
         )
 
 
+class _AutoflightHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server that can share its port with other processes."""
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        reuse_port: bool = False,
+        max_request_size: int = DEFAULT_MAX_REQUEST_SIZE,
+    ) -> None:
+        self.reuse_port = reuse_port
+        self.max_request_size = max_request_size
+        super().__init__(server_address, handler_class)
+
+    def server_bind(self) -> None:
+        if self.reuse_port:
+            if hasattr(socket, "SO_REUSEPORT"):
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            else:
+                logger.warning("SO_REUSEPORT is not supported on this platform")
+        super().server_bind()
+
+
 def run_server(
     host: str = "localhost",
     port: int = 8080,
     open_browser: bool = True,
+    reuse_port: bool = False,
+    max_request_size: int = DEFAULT_MAX_REQUEST_SIZE,
 ) -> None:
     """Start the autoflight web interface server.
 
@@ -179,8 +506,21 @@ def run_server(
         port: TCP port to listen on (default: ``8080``).
         open_browser: If ``True``, open the default browser automatically after
             the server starts (default: ``True``).
+        reuse_port: If ``True``, bind with ``SO_REUSEPORT`` so several server
+            processes can listen on the same port and the kernel spreads
+            connections between them (default: ``False``).
+        max_request_size: Largest ``/api/stitch`` request body in bytes;
+            larger requests are refused with 413 before being read
+            (default: 512 MiB).
     """
-    server = HTTPServer((host, port), _AutoflightHandler)
+    # One thread per connection: OpenCV releases the GIL while stitching, so
+    # a long /api/stitch call no longer blocks other requests
+    server = _AutoflightHTTPServer(
+        (host, port),
+        _AutoflightHandler,
+        reuse_port=reuse_port,
+        max_request_size=max_request_size,
+    )
     url = f"http://{host}:{port}"
     print(f"🚀 Autoflight web interface running at {url}")
     print("   Open the URL above in your browser, or press Ctrl+C to stop.")
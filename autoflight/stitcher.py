@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
-from typing import Callable, Optional, Sequence
-
-import cv2
-import numpy as np
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
 
+from autoflight._opencv import cv2, np
 from autoflight.exceptions import StitchingError, ValidationError
 
 logger = logging.getLogger(__name__)
@@ -15,18 +15,86 @@ logger = logging.getLogger(__name__)
 # Export public API
 __all__ = ["stitch_images"]
 
+# Working resolutions (megapixels) for each stitching stage. Registration only
+# needs enough detail for a few hundred keypoints per image; compositing
+# stays at full resolution (-1) so the output is not degraded.
+_REGISTRATION_RESOL_MPX = 0.4
+_SEAM_ESTIMATION_RESOL_MPX = 0.1
+_COMPOSITING_RESOL_MPX = -1.0
+
+# Messages for cv2.Stitcher failure statuses
+_STITCH_ERRORS = {
+    cv2.Stitcher_ERR_NEED_MORE_IMGS: "Need more images with sufficient overlap",
+    cv2.Stitcher_ERR_HOMOGRAPHY_EST_FAIL: (
+        "Homography estimation failed - images may not overlap sufficiently"
+    ),
+    cv2.Stitcher_ERR_CAMERA_PARAMS_ADJUST_FAIL: "Camera parameter adjustment failed",
+}
+
+# Configured stitchers not currently in use, per stitcher mode. stitch() is not
+# safe to call concurrently on one instance, so each call borrows its own
+_idle_stitchers: Dict[int, List[Any]] = {}
+_idle_stitchers_lock = threading.Lock()
+
+# A stitcher keeps its last inputs and working images alive until its next
+# job, so only stitchers used on small jobs are kept, and only a few of them
+_MAX_IDLE_STITCHERS = 2
+_MAX_POOLED_INPUT_PIXELS = 2_000_000
+
+
+def _opencl_available() -> bool:
+    """Return whether OpenCV can dispatch work to an OpenCL device."""
+    try:
+        return bool(cv2.ocl.haveOpenCL())
+    except cv2.error:
+        return False
+
+
+@contextlib.contextmanager
+def _borrow_stitcher(stitcher_mode: int, input_pixels: int) -> Iterator[Any]:
+    """Lend a configured ``cv2.Stitcher`` for *stitcher_mode*, creating one if none is idle.
+    
+    When the block exits the stitcher goes back to the idle pool, so
+    repeated small stitches skip constructing the feature finder, matcher
+    and bundle adjuster. Stitchers used on jobs of more than
+    ``_MAX_POOLED_INPUT_PIXELS`` input pixels, or beyond the pool's
+    capacity, are dropped instead so the memory they hold is released.
+    """
+    with _idle_stitchers_lock:
+        idle = _idle_stitchers.setdefault(stitcher_mode, [])
+        stitcher = idle.pop() if idle else None
+    if stitcher is None:
+        stitcher = cv2.Stitcher_create(stitcher_mode)
+        stitcher.setRegistrationResol(_REGISTRATION_RESOL_MPX)
+        stitcher.setSeamEstimationResol(_SEAM_ESTIMATION_RESOL_MPX)
+        stitcher.setCompositingResol(_COMPOSITING_RESOL_MPX)
+    try:
+        yield stitcher
+    finally:
+        if input_pixels <= _MAX_POOLED_INPUT_PIXELS:
+            with _idle_stitchers_lock:
+                idle = _idle_stitchers[stitcher_mode]
+                if len(idle) < _MAX_IDLE_STITCHERS:
+                    idle.append(stitcher)
+
 
 def stitch_images(
     images: Sequence[np.ndarray],
     mode: str = "panorama",
     progress_callback: Optional[Callable[[float, str], None]] = None,
+    try_use_gpu: bool = False,
 ) -> np.ndarray:
     """Stitch multiple images into a single panoramic image.
     
+    With ``try_use_gpu`` the images are passed to the stitcher as ``cv2.UMat``
+    so OpenCV's transparent API runs feature finding, warping, seam finding
+    and blending on an OpenCL device. Without one, the CPU path is used.
+    
     Args:
         images: List of images to stitch
         mode: Stitching mode ("panorama" or "scans")
         progress_callback: Optional callback for progress reporting (progress, message)
+        try_use_gpu: Whether to stitch on an OpenCL device if one is available
         
     Returns:
         Stitched panoramic image
@@ -57,22 +125,39 @@ def stitch_images(
     else:
         raise ValidationError(f"Invalid stitching mode: {mode}. Use 'panorama' or 'scans'")
     
-    # Create stitcher and perform stitching
-    stitcher = cv2.Stitcher_create(stitcher_mode)
-    
     if progress_callback:
         progress_callback(0.6, "Feature detection and matching...")
     
-    status, stitched = stitcher.stitch(images)
+    # Strided views (e.g. cropped or channel-reversed arrays) would otherwise
+    # be copied inside OpenCV at every stage; make each contiguous exactly
+    # once. The loader already returns contiguous arrays, which pass as-is
+    inputs: Sequence[Any] = [np.ascontiguousarray(image) for image in images]
+    # OpenCL use is a process-wide switch; put it back once stitching is done
+    previous_opencl: Optional[bool] = None
+    if try_use_gpu:
+        if _opencl_available():
+            previous_opencl = cv2.ocl.useOpenCL()
+            cv2.ocl.setUseOpenCL(True)
+            inputs = [cv2.UMat(image) for image in inputs]
+            logger.debug("Stitching on the OpenCL device")
+        else:
+            logger.info("No OpenCL device available, stitching on the CPU")
+    
+    input_pixels = sum(image.shape[0] * image.shape[1] for image in images)
+    try:
+        with _borrow_stitcher(stitcher_mode, input_pixels) as stitcher:
+            status, stitched = stitcher.stitch(inputs)
+        
+        # UMat inputs produce a UMat panorama; bring it back to host memory
+        if isinstance(stitched, cv2.UMat):
+            stitched = stitched.get()
+    finally:
+        if previous_opencl is not None:
+            cv2.ocl.setUseOpenCL(previous_opencl)
     
     # Check result
     if status != cv2.Stitcher_OK:
-        error_messages = {
-            cv2.Stitcher_ERR_NEED_MORE_IMGS: "Need more images with sufficient overlap",
-            cv2.Stitcher_ERR_HOMOGRAPHY_EST_FAIL: "Homography estimation failed - images may not overlap sufficiently",
-            cv2.Stitcher_ERR_CAMERA_PARAMS_ADJUST_FAIL: "Camera parameter adjustment failed",
-        }
-        error_msg = error_messages.get(status, f"Unknown error (status {status})")
+        error_msg = _STITCH_ERRORS.get(status, f"Unknown error (status {status})")
         raise StitchingError(f"Stitching failed: {error_msg}")
     
     if stitched is None:
@@ -46,8 +46,12 @@ def generate_sample_images(output_dir: Path, num_images: int = 3) -> None:
         shifted = cv2.warpAffine(base_img, shift_matrix, (base_img.shape[1], base_img.shape[0]))
         
         # Add some variation
-        noise = rng.integers(-10, 10, size=shifted.shape, dtype=np.int16)
-        shifted = np.clip(shifted.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        # Noise in [-10, 9], applied with saturating uint8 add/subtract so no
+        # int16 copies or clip are needed; only one of the two terms is nonzero
+        noise = rng.integers(0, 20, size=shifted.shape, dtype=np.uint8)
+        offset = (10, 10, 10)
+        shifted = cv2.add(shifted, cv2.subtract(noise, offset))
+        shifted = cv2.subtract(shifted, cv2.subtract(offset, noise))
         
         # Save image
         output_path = output_dir / f"sample_{i+1:02d}.jpg"
@@ -0,0 +1,129 @@
+"""Shared, cached image fixtures and helpers for the test modules."""
+
+import base64
+import functools
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional, Tuple
+from unittest.mock import patch
+
+import numpy as np
+
+
+# Scratch files only need to exist, so keep them in memory where possible
+TMP_ROOT = os.environ.get(
+    "AUTOFLIGHT_TEST_TMP", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+)
+
+
+def write_image(path: Path, image: np.ndarray, fast: bool = True) -> None:
+    """Write a test image, with the fast encoder settings unless ``fast`` is False.
+
+    Pass ``fast=False`` when the file's content matters, e.g. images that
+    must still stitch after a JPEG round trip.
+    """
+    # Deferred, here and below, so that importing the fixtures does not
+    # pull in OpenCV
+    import cv2
+
+    params = []
+    if fast:
+        # Fixtures only need to be decodable: store PNGs uncompressed and
+        # JPEGs at the lowest quality to skip the encoders' expensive stages.
+        # Each encoder warns about keys it does not know, so pass only its own
+        suffix = Path(path).suffix.lower()
+        if suffix == ".png":
+            params = [cv2.IMWRITE_PNG_COMPRESSION, 0]
+        elif suffix in (".jpg", ".jpeg"):
+            params = [cv2.IMWRITE_JPEG_QUALITY, 1]
+    cv2.imwrite(str(path), image, params)
+
+
+@functools.lru_cache(maxsize=64)
+def create_test_image(size=(100, 100), seed=0) -> np.ndarray:
+    """Create a small deterministic test image.
+
+    Images are cached per ``(size, seed)`` and returned read-only; copy one
+    before drawing on it.
+    """
+    height, width = size
+    # Raw generator bytes are uniform over 0-255 and skip integers()'s
+    # bounded sampling; frombuffer over immutable bytes is read-only
+    data = np.random.default_rng(seed).bytes(height * width * 3)
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+
+
+def image_to_b64(img: np.ndarray) -> str:
+    """Encode an ndarray image to a base64 PNG data URL."""
+    return _png_data_url(img.tobytes(), img.shape, img.dtype.str)
+
+
+@functools.lru_cache(maxsize=32)
+def _png_data_url(data: bytes, shape: tuple, dtype: str) -> str:
+    """Encode raw pixels as a PNG data URL, once per distinct image."""
+    import cv2
+
+    img = np.frombuffer(data, dtype=dtype).reshape(shape)
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return "data:image/png;base64," + base64.b64encode(buf).decode("ascii")
+
+
+@functools.lru_cache(maxsize=None)
+def shifted_pair(seed: int = 0, size: int = 128, dx: int = -20) -> Tuple[np.ndarray, np.ndarray]:
+    """Return a random image and a copy shifted horizontally by ``dx`` pixels.
+
+    The pair overlaps enough to stitch, even after a default-quality JPEG
+    round trip, while keeping the stitcher's feature detection cheap.
+    Results are cached and read-only; copy an image before modifying it.
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, size=(size, size, 3), dtype=np.uint8)
+    shift_matrix = np.float32([[1, 0, dx], [0, 1, 0]])
+    shifted = cv2.warpAffine(base, shift_matrix, (size, size))
+    base.setflags(write=False)
+    shifted.setflags(write=False)
+    return base, shifted
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Base class handing out scratch directories under one root per class.
+
+    The root is created on first use and removed once in ``tearDownClass``,
+    instead of creating and deleting a temporary tree in every test. Each
+    test also runs with the decode cache disabled and ``XDG_CACHE_HOME``
+    pointed at its own scratch directory.
+    """
+
+    _temp_root: Optional[str] = None
+
+    def setUp(self) -> None:
+        super().setUp()
+        # Keep the decode cache off, and out of the user's real cache
+        # directory when a test turns it on
+        env = {
+            "XDG_CACHE_HOME": os.path.join(self._temp_dir(), "cache"),
+            "AUTOFLIGHT_DECODE_CACHE": "0",
+        }
+        env_patch = patch.dict(os.environ, env)
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if cls._temp_root is not None:
+            shutil.rmtree(cls._temp_root, ignore_errors=True)
+            cls._temp_root = None
+        super().tearDownClass()
+
+    def _temp_dir(self) -> str:
+        """Create an empty directory for the current test."""
+        cls = type(self)
+        if cls._temp_root is None:
+            cls._temp_root = tempfile.mkdtemp(prefix="autoflight-test-", dir=TMP_ROOT)
+        return tempfile.mkdtemp(dir=cls._temp_root)
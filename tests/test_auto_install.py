@@ -1,7 +1,10 @@
 import subprocess
 import sys
+import tempfile
 import unittest
 import os
+from pathlib import Path
+from unittest.mock import patch
 
 
 class TestAutoInstall(unittest.TestCase):
@@ -12,16 +15,56 @@ class TestAutoInstall(unittest.TestCase):
         ensure_dependencies()
     
     def test_module_import_triggers_auto_install(self) -> None:
-        """Test that importing autoflight triggers dependency check."""
+        """Test that accessing the main API triggers dependency check."""
         # Run in a subprocess to test fresh import
         result = subprocess.run(
-            [sys.executable, "-c", "import autoflight"],
+            [sys.executable, "-c", "import autoflight; autoflight.create_orthomosaic"],
             capture_output=True,
             text=True,
         )
         # Should succeed regardless of whether deps were already installed
         self.assertEqual(result.returncode, 0)
     
+    def test_package_import_is_lazy(self) -> None:
+        """Test that a bare package import does not load OpenCV."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, autoflight; print('cv2' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.strip(), "False")
+    
+    def test_opencv_modules_run_dependency_check(self) -> None:
+        """Test that every module importing OpenCV runs the dependency check first."""
+        for module in ("autoflight.stitcher", "autoflight.output", "autoflight.server"):
+            code = (
+                "import builtins, sys\n"
+                "real_import = builtins.__import__\n"
+                "def guarded(name, *args, **kwargs):\n"
+                "    if name == 'cv2' and 'autoflight._ensure_deps' not in sys.modules:\n"
+                "        raise SystemExit('cv2 imported before the dependency check')\n"
+                "    return real_import(name, *args, **kwargs)\n"
+                "builtins.__import__ = guarded\n"
+                f"import {module}\n"
+            )
+            result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+            self.assertEqual(result.returncode, 0, f"{module}: {result.stderr}")
+    
+    def test_lazy_exports_resolve(self) -> None:
+        """Test that names in __all__ resolve on attribute access."""
+        import autoflight
+        
+        for name in autoflight.__all__:
+            self.assertTrue(hasattr(autoflight, name), name)
+        self.assertIn("create_orthomosaic", dir(autoflight))
+        with self.assertRaises(AttributeError):
+            autoflight.does_not_exist
+    
     def test_orthomosaic_module_can_be_run(self) -> None:
         """Test that the orthomosaic module can be run with --help."""
         result = subprocess.run(
@@ -59,3 +102,122 @@ class TestAutoInstall(unittest.TestCase):
         import autoflight
         # If we get here without errors, caching works
         self.assertTrue(True)
+    
+    def test_marker_file_skips_module_lookup(self) -> None:
+        """Test that a successful check is recorded on disk and reused."""
+        from autoflight import _ensure_deps
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            env = {"XDG_CACHE_HOME": temp_dir}
+            with patch.dict(os.environ, env), patch.object(_ensure_deps, "_deps_checked", False):
+                os.environ.pop("AUTOFLIGHT_NO_AUTO_INSTALL", None)
+                _ensure_deps.ensure_dependencies()
+                marker = _ensure_deps._marker_path()
+                self.assertTrue(marker.exists())
+                self.assertEqual(marker.parent, Path(temp_dir) / "autoflight")
+            
+            with patch.dict(os.environ, env), patch.object(_ensure_deps, "_deps_checked", False):
+                os.environ.pop("AUTOFLIGHT_NO_AUTO_INSTALL", None)
+                with patch.object(_ensure_deps, "_is_installed") as is_installed:
+                    _ensure_deps.ensure_dependencies()
+                is_installed.assert_not_called()
+    
+    def test_install_package_skips_pip_self_check(self) -> None:
+        """Test that pip runs non-interactively with a persistent cache."""
+        from autoflight import _ensure_deps
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(os.environ, {"XDG_CACHE_HOME": temp_dir}):
+                os.environ.pop("PIP_CACHE_DIR", None)
+                with patch.object(_ensure_deps.subprocess, "check_call") as check_call:
+                    _ensure_deps._install_package("numpy>=1.26.0")
+        
+        argv = check_call.call_args.args[0]
+        env = check_call.call_args.kwargs["env"]
+        self.assertIn("--disable-pip-version-check", argv)
+        self.assertIn("--no-input", argv)
+        self.assertEqual(argv[-1], "numpy>=1.26.0")
+        self.assertEqual(env["PIP_CACHE_DIR"], str(Path(temp_dir) / "autoflight" / "pip"))
+    
+    def test_missing_dependencies_installed_in_one_call(self) -> None:
+        """Test that all missing dependencies are installed with one wheel-only pip run."""
+        from autoflight import _ensure_deps
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(os.environ, {"XDG_CACHE_HOME": temp_dir}), \
+                    patch.object(_ensure_deps, "_deps_checked", False), \
+                    patch.object(_ensure_deps, "_is_installed", return_value=False), \
+                    patch.object(_ensure_deps.subprocess, "check_call") as check_call, \
+                    patch("sys.stderr"):
+                os.environ.pop("AUTOFLIGHT_NO_AUTO_INSTALL", None)
+                _ensure_deps.ensure_dependencies()
+        
+        self.assertEqual(check_call.call_count, 1)
+        argv = check_call.call_args.args[0]
+        self.assertIn("--only-binary=:all:", argv)
+        self.assertIn("opencv-python>=4.9.0,<5.0", argv)
+        self.assertIn("numpy>=1.26.0", argv)
+    
+    def test_batched_install_falls_back_per_package(self) -> None:
+        """Test that a failed batched install is retried one package at a time."""
+        from autoflight import _ensure_deps
+        
+        calls = []
+        
+        def fake_check_call(argv, **kwargs):
+            calls.append(argv)
+            # Only the batched install (both specs in one call) fails
+            if "numpy>=1.26.0" in argv and "opencv-python>=4.9.0,<5.0" in argv:
+                raise subprocess.CalledProcessError(1, argv)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(os.environ, {"XDG_CACHE_HOME": temp_dir}), \
+                    patch.object(_ensure_deps, "_deps_checked", False), \
+                    patch.object(_ensure_deps, "_is_installed", return_value=False), \
+                    patch.object(_ensure_deps.subprocess, "check_call", fake_check_call), \
+                    patch("sys.stderr"):
+                os.environ.pop("AUTOFLIGHT_NO_AUTO_INSTALL", None)
+                _ensure_deps.ensure_dependencies()
+        
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[1][-1], "opencv-python>=4.9.0,<5.0")
+        self.assertEqual(calls[2][-1], "numpy>=1.26.0")
+        # The retries are still restricted to wheels
+        self.assertIn("--only-binary=:all:", calls[1])
+        self.assertIn("--only-binary=:all:", calls[2])
+    
+    def test_per_package_fallback_reports_all_failures(self) -> None:
+        """Test that the fallback installs what it can and names every failure."""
+        from autoflight import _ensure_deps
+        
+        calls = []
+        
+        def fake_check_call(argv, **kwargs):
+            calls.append(argv)
+            if "opencv-python>=4.9.0,<5.0" in argv:
+                raise subprocess.CalledProcessError(1, argv)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict(os.environ, {"XDG_CACHE_HOME": temp_dir}), \
+                    patch.object(_ensure_deps, "_deps_checked", False), \
+                    patch.object(_ensure_deps, "_is_installed", return_value=False), \
+                    patch.object(_ensure_deps.subprocess, "check_call", fake_check_call), \
+                    patch("sys.stderr"):
+                os.environ.pop("AUTOFLIGHT_NO_AUTO_INSTALL", None)
+                with self.assertRaises(RuntimeError) as ctx:
+                    _ensure_deps.ensure_dependencies()
+                self.assertFalse(_ensure_deps._marker_path().exists())
+        
+        # numpy is still attempted after OpenCV fails
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[2][-1], "numpy>=1.26.0")
+        self.assertIn("opencv-python>=4.9.0,<5.0", str(ctx.exception))
+        self.assertNotIn("numpy", str(ctx.exception))
+    
+    def test_is_installed_checks_sys_modules_first(self) -> None:
+        """Test that already-imported modules skip the import path search."""
+        from autoflight import _ensure_deps
+        
+        with patch.object(_ensure_deps.importlib.util, "find_spec") as find_spec:
+            self.assertTrue(_ensure_deps._is_installed("sys"))
+        find_spec.assert_not_called()
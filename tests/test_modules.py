@@ -1,41 +1,78 @@
 """Tests for the modular components."""
 
-import tempfile
+import base64
+import os
+import re
+import sys
+import time
 import unittest
 from pathlib import Path
+from typing import Dict
+from unittest.mock import MagicMock, patch
 
 import cv2
 import numpy as np
 
+from _fixtures import TempDirTestCase, create_test_image, shifted_pair, write_image
+from autoflight import image_loader
 from autoflight.image_loader import (
+    iter_images,
     load_images,
     load_single_image,
     is_supported_image,
     validate_path,
 )
+from autoflight import stitcher as stitcher_module
 from autoflight.stitcher import stitch_images
-from autoflight.output import save_image, save_html
+from autoflight.output import encode_png, save_image, save_html
+from autoflight.security import SecurityLimits
 from autoflight.exceptions import (
     ImageLoadError,
+    SecurityError,
     ValidationError,
     StitchingError,
 )
 
 
-def _write_image(path: Path, image: np.ndarray) -> None:
-    """Helper to write test images."""
-    cv2.imwrite(str(path), image)
+def _exif_app1(orientation: int) -> bytes:
+    """Build a little-endian EXIF APP1 segment carrying an orientation tag."""
+    tiff = (
+        b"II*\x00" + (8).to_bytes(4, "little")
+        + (1).to_bytes(2, "little")
+        + (0x0112).to_bytes(2, "little") + (3).to_bytes(2, "little")
+        + (1).to_bytes(4, "little") + orientation.to_bytes(2, "little") + b"\x00\x00"
+        + (0).to_bytes(4, "little")
+    )
+    payload = b"Exif\x00\x00" + tiff
+    return b"\xff\xe1" + (len(payload) + 2).to_bytes(2, "big") + payload
 
 
-def _create_test_image(size=(100, 100), seed=0) -> np.ndarray:
-    """Create a test image."""
-    rng = np.random.default_rng(seed)
-    return rng.integers(0, 255, size=(*size, 3), dtype=np.uint8)
-
-
-class TestImageLoader(unittest.TestCase):
+class TestImageLoader(TempDirTestCase):
     """Tests for image_loader module."""
     
+    def _assert_same_pixels(self, actual: np.ndarray, expected: np.ndarray) -> None:
+        """Assert two images are identical with one buffer comparison."""
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertEqual(actual.dtype, expected.dtype)
+        self.assertTrue(actual.tobytes() == expected.tobytes(), "pixel data differs")
+    
+    def _stage_images(self, directory: Path, images: Dict[str, np.ndarray]):
+        """Create empty placeholder files and patch the decoder to return ``images``.
+        
+        For tests of the loaders' scanning and scheduling, which do not need
+        a real encode and decode round trip. Returns the patcher to enter.
+        """
+        fixtures = {}
+        for name, image in images.items():
+            path = directory / name
+            path.write_bytes(b"")
+            fixtures[str(path)] = image
+        
+        def fake_load(path, *args):
+            return fixtures[str(path)]
+        
+        return patch("autoflight.image_loader.load_single_image", side_effect=fake_load)
+    
     def test_is_supported_image(self) -> None:
         """Test image format detection."""
         self.assertTrue(is_supported_image(Path("test.jpg")))
@@ -46,78 +83,355 @@ class TestImageLoader(unittest.TestCase):
         self.assertTrue(is_supported_image(Path("test.tiff")))
         self.assertFalse(is_supported_image(Path("test.txt")))
         self.assertFalse(is_supported_image(Path("test.pdf")))
+        self.assertTrue(is_supported_image(Path("test.Jpg")))
+        self.assertTrue(is_supported_image(Path("test.TIFF")))
+        self.assertFalse(is_supported_image(Path(".jpg")))
+        self.assertFalse(is_supported_image(Path("test.jpg.txt")))
     
     def test_validate_path_exists(self) -> None:
         """Test path validation for existing paths."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            # Should not raise for existing directory
-            validate_path(temp_path, must_exist=True, must_be_dir=True)
-            
-            # Should raise ValidationError for non-existent path
-            with self.assertRaises(ValidationError):
-                validate_path(temp_path / "nonexistent", must_exist=True)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        # Should not raise for existing directory
+        validate_path(temp_path, must_exist=True, must_be_dir=True)
+        
+        # Should raise ValidationError for non-existent path
+        with self.assertRaises(ValidationError):
+            validate_path(temp_path / "nonexistent", must_exist=True)
+    
+    def test_validate_path_rejects_invalid(self) -> None:
+        """Test path validation rejects files-as-dirs and NUL bytes."""
+        temp_dir = self._temp_dir()
+        file_path = Path(temp_dir) / "file.txt"
+        file_path.write_text("test")
+        
+        with self.assertRaises(ValidationError):
+            validate_path(file_path, must_exist=True, must_be_dir=True)
+        with self.assertRaises(ValidationError):
+            validate_path(Path(temp_dir + "\x00evil"), must_exist=False)
+        # Non-existent paths are fine when existence is not required
+        validate_path(Path(temp_dir) / "missing", must_exist=False)
     
     def test_load_single_image(self) -> None:
         """Test loading a single image."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            image_path = temp_path / "test.jpg"
-            test_image = _create_test_image()
-            _write_image(image_path, test_image)
-            
-            loaded = load_single_image(image_path)
-            self.assertIsNotNone(loaded)
-            self.assertEqual(loaded.shape, test_image.shape)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image_path = temp_path / "test.jpg"
+        test_image = create_test_image()
+        write_image(image_path, test_image)
+        
+        loaded = load_single_image(image_path)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.shape, test_image.shape)
+    
+    def test_load_single_image_stats_once(self) -> None:
+        """Test that loading an image stats the file a single time."""
+        temp_dir = self._temp_dir()
+        image_path = Path(temp_dir) / "test.png"
+        write_image(image_path, create_test_image())
+        
+        with patch.dict(os.environ, {"AUTOFLIGHT_DECODE_CACHE": "1"}), \
+                patch("os.stat", wraps=os.stat) as stat:
+            load_single_image(image_path)
+        
+        calls = [c for c in stat.call_args_list if str(c.args[0]) == str(image_path)]
+        self.assertEqual(len(calls), 1)
     
     def test_load_single_image_failure(self) -> None:
         """Test loading non-existent image fails."""
         with self.assertRaises((ImageLoadError, ValidationError)):
             load_single_image(Path("/nonexistent/image.jpg"))
     
+    def test_load_single_image_corrupt(self) -> None:
+        """Test loading a file that is not a decodable image fails."""
+        temp_dir = self._temp_dir()
+        image_path = Path(temp_dir) / "broken.jpg"
+        image_path.write_bytes(b"not an image")
+        
+        with self.assertRaises(ImageLoadError):
+            load_single_image(image_path)
+    
+    def test_load_single_image_jpeg_uses_turbojpeg(self) -> None:
+        """Test that JPEGs go through libjpeg-turbo when it is available."""
+        temp_dir = self._temp_dir()
+        image_path = Path(temp_dir) / "test.jpg"
+        write_image(image_path, create_test_image())
+        decoded = create_test_image(seed=1)
+        
+        with patch.object(image_loader, "_get_turbojpeg", return_value=lambda buf: decoded), \
+                patch("cv2.imdecode") as imdecode:
+            image = load_single_image(image_path)
+        
+        imdecode.assert_not_called()
+        self.assertIs(image, decoded)
+    
+    def test_load_single_image_turbojpeg_falls_back(self) -> None:
+        """Test that rotated or rejected JPEGs are decoded by OpenCV."""
+        def never(buf):
+            self.fail("rotated JPEG sent to TurboJPEG")
+        
+        def failing_decode(buf):
+            raise OSError("unsupported")
+        
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        ok, encoded = cv2.imencode(".jpg", create_test_image(size=(60, 100)))
+        self.assertTrue(ok)
+        data = encoded.tobytes()
+        rotated_path = temp_path / "rotated.jpg"
+        rotated_path.write_bytes(data[:2] + _exif_app1(6) + data[2:])
+        plain_path = temp_path / "plain.jpg"
+        plain_path.write_bytes(data)
+        
+        with patch.object(image_loader, "_get_turbojpeg", return_value=never):
+            rotated = load_single_image(rotated_path)
+        with patch.object(image_loader, "_get_turbojpeg", return_value=failing_decode):
+            plain = load_single_image(plain_path)
+        
+        # Orientation 6 is a 90 degree rotation, which OpenCV applies
+        self.assertEqual(rotated.shape, (100, 60, 3))
+        self.assertEqual(plain.shape, (60, 100, 3))
+    
+    def test_load_single_image_memmaps_large_tiff(self) -> None:
+        """Test that large TIFFs are read through a memory map into contiguous BGR."""
+        temp_dir = self._temp_dir()
+        image_path = Path(temp_dir) / "large.tif"
+        write_image(image_path, create_test_image())
+        rgb = create_test_image(seed=1)
+        fake_tifffile = MagicMock()
+        fake_tifffile.memmap.return_value = rgb
+        
+        with patch("autoflight.image_loader._MEMMAP_TIFF_MIN_BYTES", 0), \
+                patch.dict(sys.modules, {"tifffile": fake_tifffile}), \
+                patch("cv2.imdecode") as imdecode:
+            image = load_single_image(image_path)
+        
+        imdecode.assert_not_called()
+        np.testing.assert_array_equal(image, rgb[..., ::-1])
+        # Ready for the stitcher without another copy
+        self.assertTrue(image.flags["C_CONTIGUOUS"])
+    
+    def test_load_single_image_unmappable_tiff_is_decoded(self) -> None:
+        """Test that TIFFs tifffile cannot map are decoded by OpenCV."""
+        temp_dir = self._temp_dir()
+        image_path = Path(temp_dir) / "compressed.tif"
+        test_image = create_test_image()
+        write_image(image_path, test_image)
+        fake_tifffile = MagicMock()
+        fake_tifffile.memmap.side_effect = ValueError("image data are not memory-mappable")
+        
+        with patch("autoflight.image_loader._MEMMAP_TIFF_MIN_BYTES", 0), \
+                patch.dict(sys.modules, {"tifffile": fake_tifffile}):
+            image = load_single_image(image_path)
+        
+        np.testing.assert_array_equal(image, test_image)
+    
+    def test_jpeg_orientation(self) -> None:
+        """Test reading the EXIF orientation from JPEG headers."""
+        ok, encoded = cv2.imencode(".jpg", create_test_image())
+        self.assertTrue(ok)
+        data = encoded.tobytes()
+        self.assertEqual(image_loader._jpeg_orientation(data), 1)
+        self.assertEqual(image_loader._jpeg_orientation(data[:2] + _exif_app1(6) + data[2:]), 6)
+        self.assertEqual(image_loader._jpeg_orientation(b"not a jpeg"), 1)
+    
+    def test_load_single_image_uses_decode_cache(self) -> None:
+        """Test that a second load is served from the decode cache."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image_path = temp_path / "test.png"
+        test_image = create_test_image()
+        write_image(image_path, test_image)
+        
+        cache_home = Path(os.environ["XDG_CACHE_HOME"])
+        with patch.dict(os.environ, {"AUTOFLIGHT_DECODE_CACHE": "1"}):
+            first = load_single_image(image_path)
+            self.assertEqual(len(list(cache_home.rglob("*.npy"))), 1)
+            
+            with patch("cv2.imdecode") as imdecode:
+                second = load_single_image(image_path)
+            imdecode.assert_not_called()
+        np.testing.assert_array_equal(first, second)
+    
+    def test_load_single_image_decode_cache_disabled(self) -> None:
+        """Test that the decode cache is off unless AUTOFLIGHT_DECODE_CACHE=1."""
+        temp_dir = self._temp_dir()
+        image_path = Path(temp_dir) / "test.png"
+        write_image(image_path, create_test_image())
+        
+        cache_home = Path(os.environ["XDG_CACHE_HOME"])
+        for value in (None, "0"):
+            with patch.dict(os.environ):
+                os.environ.pop("AUTOFLIGHT_DECODE_CACHE")
+                if value is not None:
+                    os.environ["AUTOFLIGHT_DECODE_CACHE"] = value
+                load_single_image(image_path)
+            self.assertFalse(cache_home.exists())
+    
+    def test_decode_cache_pruned_once_per_batch(self) -> None:
+        """Test that a batch load trims the decode cache once, after all writes."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        for i in range(3):
+            write_image(temp_path / f"img{i}.png", create_test_image(seed=i))
+        
+        with patch.dict(os.environ, {"AUTOFLIGHT_DECODE_CACHE": "1"}), \
+                patch.object(image_loader, "_prune_decode_cache") as prune:
+            load_images(temp_path, parallel=False)
+        prune.assert_called_once()
+    
     def test_load_images_sequential(self) -> None:
         """Test loading multiple images sequentially."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            _write_image(temp_path / "img1.jpg", _create_test_image(seed=1))
-            _write_image(temp_path / "img2.jpg", _create_test_image(seed=2))
-            
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image_one = create_test_image(seed=1)
+        image_two = create_test_image(seed=2)
+        staged = {"img1.jpg": image_one, "img2.jpg": image_two}
+        
+        with self._stage_images(temp_path, staged):
             images = load_images(temp_path, parallel=False)
-            self.assertEqual(len(images), 2)
+        self.assertEqual(len(images), 2)
+        self.assertIs(images[0], image_one)
+        self.assertIs(images[1], image_two)
     
     def test_load_images_parallel(self) -> None:
         """Test loading multiple images in parallel."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            image_one = _create_test_image(seed=1)
-            image_two = _create_test_image(seed=2)
-            image_three = _create_test_image(seed=3)
-            _write_image(temp_path / "img1.png", image_one)
-            _write_image(temp_path / "img2.png", image_two)
-            _write_image(temp_path / "img3.png", image_three)
-            
-            images = load_images(temp_path, parallel=True)
-            self.assertEqual(len(images), 3)
-            np.testing.assert_array_equal(images[0], image_one)
-            np.testing.assert_array_equal(images[1], image_two)
-            np.testing.assert_array_equal(images[2], image_three)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image_one = create_test_image(seed=1)
+        image_two = create_test_image(seed=2)
+        image_three = create_test_image(seed=3)
+        write_image(temp_path / "img1.png", image_one)
+        write_image(temp_path / "img2.png", image_two)
+        write_image(temp_path / "img3.png", image_three)
+        
+        images = load_images(temp_path, parallel=True)
+        self.assertEqual(len(images), 3)
+        self._assert_same_pixels(images[0], image_one)
+        self._assert_same_pixels(images[1], image_two)
+        self._assert_same_pixels(images[2], image_three)
+    
+    def test_load_images_processes(self) -> None:
+        """Test loading images on a process pool preserves order and pixels."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        expected = [create_test_image(seed=i) for i in range(4)]
+        for i, image in enumerate(expected):
+            write_image(temp_path / f"img{i}.png", image)
+        
+        images = load_images(temp_path, parallel=True, max_workers=2, use_processes=True)
+        self.assertEqual(len(images), 4)
+        for loaded, image in zip(images, expected):
+            self._assert_same_pixels(loaded, image)
+    
+    def test_load_images_parallel_stops_on_failure(self) -> None:
+        """Test that a failed load cancels the images still queued."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        for i in range(20):
+            (temp_path / f"img{i:02d}.png").write_bytes(b"")
+        
+        def fake_load(path, *args):
+            if path.name == "img00.png":
+                raise ImageLoadError("broken")
+            time.sleep(0.01)
+            return create_test_image(size=(10, 10))
+        
+        with patch("autoflight.image_loader.load_single_image", side_effect=fake_load) as loader:
+            with self.assertRaises(ImageLoadError):
+                load_images(temp_path, parallel=True, max_workers=1)
+        self.assertLess(loader.call_count, 20)
+    
+    def test_iter_images_is_ordered_and_bounded(self) -> None:
+        """Test that iter_images yields in order with a bounded read-ahead."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        for i in range(10):
+            (temp_path / f"img{i:02d}.png").write_bytes(b"")
+        
+        def fake_load(path, *args):
+            return np.full((2, 2, 3), int(path.stem[3:]), dtype=np.uint8)
+        
+        with patch("autoflight.image_loader.load_single_image", side_effect=fake_load) as loader:
+            images = iter_images(temp_path, parallel=True, max_workers=1)
+            first = next(images)
+            time.sleep(0.05)
+            self.assertLessEqual(loader.call_count, 3)
+            rest = list(images)
+        
+        self.assertEqual([int(img[0, 0, 0]) for img in [first] + rest], list(range(10)))
+    
+    def test_load_images_checks_sizes_before_decoding(self) -> None:
+        """Test that an oversized file fails the batch before any decode."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        (temp_path / "img1.png").write_bytes(b"x" * 10)
+        (temp_path / "img2.png").write_bytes(b"x" * 100)
+        
+        with patch("autoflight.image_loader.load_single_image") as loader:
+            with self.assertRaises(SecurityError):
+                load_images(temp_path, limits=SecurityLimits(max_file_size=50))
+        loader.assert_not_called()
+    
+    def test_load_images_reuses_thread_pool(self) -> None:
+        """Test that repeated parallel loads share one decode thread pool."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        staged = {"img1.png": create_test_image(seed=1), "img2.png": create_test_image(seed=2)}
+        
+        with self._stage_images(temp_path, staged):
+            load_images(temp_path, parallel=True, max_workers=3)
+            pool = image_loader._thread_pools[3]
+            load_images(temp_path, parallel=True, max_workers=3)
+        self.assertIs(image_loader._thread_pools[3], pool)
+    
+    def test_iter_images_validates_eagerly(self) -> None:
+        """Test that directory errors surface before iteration starts."""
+        with self.assertRaises(ValidationError):
+            iter_images(Path("/nonexistent/dir"))
+    
+    def test_iter_images_leaves_thread_count_alone(self) -> None:
+        """Test that a suspended parallel iterator does not change OpenCV's threads."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        staged = {"img1.png": create_test_image(seed=1), "img2.png": create_test_image(seed=2)}
+        
+        before = cv2.getNumThreads()
+        with self._stage_images(temp_path, staged), \
+                patch("cv2.setNumThreads") as set_num_threads:
+            images = iter_images(temp_path, parallel=True)
+            next(images)
+            self.assertEqual(cv2.getNumThreads(), before)
+            list(images)
+        set_num_threads.assert_not_called()
     
     def test_load_images_no_images(self) -> None:
         """Test loading from empty directory fails."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            with self.assertRaises(ImageLoadError):
-                load_images(temp_path)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        with self.assertRaises(ImageLoadError):
+            load_images(temp_path)
     
     def test_load_images_filters_non_images(self) -> None:
         """Test that non-image files are filtered out."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            _write_image(temp_path / "img1.jpg", _create_test_image(seed=1))
-            (temp_path / "readme.txt").write_text("test")
-            
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        (temp_path / "readme.txt").write_text("test")
+        
+        with self._stage_images(temp_path, {"img1.jpg": create_test_image(seed=1)}):
             images = load_images(temp_path)
-            self.assertEqual(len(images), 1)
+        self.assertEqual(len(images), 1)
+    
+    def test_load_images_skips_directories_and_bare_names(self) -> None:
+        """Test that only regular files with a real image extension are loaded."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        (temp_path / "folder.jpg").mkdir()
+        (temp_path / "jpg").write_text("test")
+        
+        with self._stage_images(temp_path, {"IMG1.JPG": create_test_image(seed=1)}):
+            images = load_images(temp_path)
+        self.assertEqual(len(images), 1)
 
 
 class TestStitcher(unittest.TestCase):
@@ -125,7 +439,7 @@ class TestStitcher(unittest.TestCase):
     
     def test_stitch_images_single(self) -> None:
         """Test stitching with a single image returns the image."""
-        image = _create_test_image()
+        image = create_test_image()
         result = stitch_images([image])
         self.assertIsNotNone(result)
         np.testing.assert_array_equal(result, image)
@@ -137,160 +451,335 @@ class TestStitcher(unittest.TestCase):
     
     def test_stitch_images_multiple(self) -> None:
         """Test stitching multiple overlapping images."""
-        rng = np.random.default_rng(0)
-        base = rng.integers(0, 255, size=(300, 300, 3), dtype=np.uint8)
-        shift_matrix = np.float32([[1, 0, -50], [0, 1, 0]])
-        shifted = cv2.warpAffine(base, shift_matrix, (300, 300))
+        base, shifted = shifted_pair()
         
         result = stitch_images([base, shifted])
         self.assertIsNotNone(result)
         self.assertGreater(result.shape[0], 0)
         self.assertGreater(result.shape[1], 0)
     
+    def test_stitch_images_registration_resolution(self) -> None:
+        """Test that registration runs below full resolution."""
+        stitcher = MagicMock()
+        stitcher.stitch.return_value = (cv2.Stitcher_OK, create_test_image())
+        
+        with patch("cv2.Stitcher_create", return_value=stitcher), patch.dict(
+            "autoflight.stitcher._idle_stitchers", clear=True
+        ):
+            stitch_images([create_test_image(seed=1), create_test_image(seed=2)])
+        
+        stitcher.setRegistrationResol.assert_called_once_with(0.4)
+        stitcher.setCompositingResol.assert_called_once_with(-1.0)
+    
+    def test_stitch_images_reuses_stitcher(self) -> None:
+        """Test that consecutive stitches share one configured stitcher."""
+        stitcher = MagicMock()
+        stitcher.stitch.return_value = (cv2.Stitcher_OK, create_test_image())
+        images = [create_test_image(seed=1), create_test_image(seed=2)]
+        
+        with patch("cv2.Stitcher_create", return_value=stitcher) as create, patch.dict(
+            "autoflight.stitcher._idle_stitchers", clear=True
+        ):
+            stitch_images(images)
+            stitch_images(images)
+            stitch_images(images, mode="scans")
+        
+        self.assertEqual(create.call_count, 2)
+        self.assertEqual(stitcher.stitch.call_count, 3)
+    
+    def test_stitch_images_drops_stitcher_after_large_job(self) -> None:
+        """Test that a stitcher used on a large job is not kept in the pool."""
+        stitcher = MagicMock()
+        stitcher.stitch.return_value = (cv2.Stitcher_OK, create_test_image())
+        large = np.zeros((1000, 1001, 3), dtype=np.uint8)
+        
+        with patch("cv2.Stitcher_create", return_value=stitcher) as create, patch.dict(
+            "autoflight.stitcher._idle_stitchers", clear=True
+        ):
+            stitch_images([large, large])
+            stitch_images([large, large])
+            self.assertEqual(create.call_count, 2)
+            stitch_images([create_test_image(seed=1), create_test_image(seed=2)])
+            self.assertEqual(len(stitcher_module._idle_stitchers[cv2.STITCHER_PANORAMA]), 1)
+    
+    def test_stitch_images_gpu(self) -> None:
+        """Test that the OpenCL (UMat) path returns a host array."""
+        base, shifted = shifted_pair()
+        
+        # UMat falls back to the CPU when no OpenCL device is present
+        previous = cv2.ocl.useOpenCL()
+        cv2.ocl.setUseOpenCL(False)
+        self.addCleanup(cv2.ocl.setUseOpenCL, previous)
+        with patch("autoflight.stitcher._opencl_available", return_value=True):
+            result = stitch_images([base, shifted], try_use_gpu=True)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertGreater(result.shape[1], 0)
+        # The process-wide OpenCL switch is left as it was
+        self.assertFalse(cv2.ocl.useOpenCL())
+    
     def test_stitch_images_invalid_mode(self) -> None:
         """Test stitching with invalid mode fails."""
-        image = _create_test_image()
+        image = create_test_image()
         with self.assertRaises(ValidationError):
             stitch_images([image, image], mode="invalid")
 
 
-class TestOutput(unittest.TestCase):
+class TestOutput(TempDirTestCase):
     """Tests for output module."""
     
     def test_save_image(self) -> None:
         """Test saving an image."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "output.jpg"
-            image = _create_test_image()
-            
-            save_image(image, output_path)
-            self.assertTrue(output_path.exists())
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "output.jpg"
+        image = create_test_image()
+        
+        save_image(image, output_path)
+        self.assertTrue(output_path.exists())
     
     def test_save_image_creates_dirs(self) -> None:
         """Test saving an image creates parent directories."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "subdir" / "output.jpg"
-            image = _create_test_image()
-            
-            save_image(image, output_path, create_dirs=True)
-            self.assertTrue(output_path.exists())
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "subdir" / "output.jpg"
+        image = create_test_image()
+        
+        save_image(image, output_path, create_dirs=True)
+        self.assertTrue(output_path.exists())
     
     def test_save_image_no_create_dirs_fails(self) -> None:
         """Test saving fails when parent directory doesn't exist and create_dirs is False."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "nonexistent" / "output.jpg"
-            image = _create_test_image()
-            
-            with self.assertRaises(ValidationError):
-                save_image(image, output_path, create_dirs=False)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "nonexistent" / "output.jpg"
+        image = create_test_image()
+        
+        with self.assertRaises(ValidationError):
+            save_image(image, output_path, create_dirs=False)
     
     def test_save_image_empty_fails(self) -> None:
         """Test saving empty image fails."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "output.jpg"
-            
-            with self.assertRaises(ValidationError):
-                save_image(None, output_path)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "output.jpg"
+        
+        with self.assertRaises(ValidationError):
+            save_image(None, output_path)
+    
+    def test_save_image_large_tiff_is_tiled(self) -> None:
+        """Test that large TIFF outputs are streamed through tifffile."""
+        temp_dir = self._temp_dir()
+        output_path = Path(temp_dir) / "output.tif"
+        image = create_test_image()
+        fake_tifffile = MagicMock()
+        
+        with patch("autoflight.output._TILED_TIFF_MIN_BYTES", 0), \
+                patch.dict(sys.modules, {"tifffile": fake_tifffile}), \
+                patch("cv2.imwrite") as imwrite:
+            save_image(image, output_path)
+        
+        imwrite.assert_not_called()
+        args, kwargs = fake_tifffile.imwrite.call_args
+        np.testing.assert_array_equal(args[1], image[..., ::-1])
+        self.assertEqual(kwargs["tile"], (512, 512))
+        self.assertTrue(kwargs["bigtiff"])
+    
+    def test_save_image_large_tiff_without_tifffile(self) -> None:
+        """Test that large TIFFs fall back to OpenCV without tifffile."""
+        temp_dir = self._temp_dir()
+        output_path = Path(temp_dir) / "output.tif"
+        
+        with patch("autoflight.output._TILED_TIFF_MIN_BYTES", 0), \
+                patch.dict(sys.modules, {"tifffile": None}):
+            save_image(create_test_image(), output_path)
+        
+        self.assertTrue(output_path.exists())
     
     def test_save_image_with_quality(self) -> None:
         """Test saving an image with custom quality settings."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "output.jpg"
-            image = _create_test_image()
-            
-            # Test with custom quality
-            save_image(image, output_path, quality=50)
-            self.assertTrue(output_path.exists())
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "output.jpg"
+        image = create_test_image()
+        
+        # Test with custom quality
+        save_image(image, output_path, quality=50)
+        self.assertTrue(output_path.exists())
+    
+    def test_save_image_non_contiguous(self) -> None:
+        """Test saving a strided view produces the same pixels."""
+        temp_dir = self._temp_dir()
+        output_path = Path(temp_dir) / "output.png"
+        view = create_test_image()[..., ::-1]
+        self.assertFalse(view.flags["C_CONTIGUOUS"])
+        
+        save_image(view, output_path)
+        
+        np.testing.assert_array_equal(cv2.imread(str(output_path)), view)
+    
+    def test_save_image_jpeg_optimize(self) -> None:
+        """Test that Huffman optimization does not grow the JPEG."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image = cv2.GaussianBlur(create_test_image(size=(200, 200)), (9, 9), 0)
+        
+        save_image(image, temp_path / "optimized.jpg")
+        save_image(image, temp_path / "plain.jpg", optimize=False)
+        
+        self.assertLessEqual(
+            (temp_path / "optimized.jpg").stat().st_size,
+            (temp_path / "plain.jpg").stat().st_size,
+        )
     
     def test_save_image_html(self) -> None:
         """Test that save_image delegates to HTML output for .html extension."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "output.html"
-            image = _create_test_image()
-            
-            save_image(image, output_path)
-            self.assertTrue(output_path.exists())
-            content = output_path.read_text(encoding="utf-8")
-            self.assertIn("<!DOCTYPE html>", content)
-            self.assertIn("data:image/png;base64,", content)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "output.html"
+        image = create_test_image()
+        
+        save_image(image, output_path)
+        self.assertTrue(output_path.exists())
+        content = output_path.read_text(encoding="utf-8")
+        self.assertIn("<!DOCTYPE html>", content)
+        self.assertIn("data:image/png;base64,", content)
 
 
-class TestHtmlOutput(unittest.TestCase):
+class TestHtmlOutput(TempDirTestCase):
     """Tests for save_html function."""
     
     def test_save_html_creates_file(self) -> None:
         """Test that save_html creates an HTML file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "report.html"
-            image = _create_test_image()
-            
-            save_html(image, output_path)
-            self.assertTrue(output_path.exists())
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "report.html"
+        image = create_test_image()
+        
+        save_html(image, output_path)
+        self.assertTrue(output_path.exists())
     
     def test_save_html_content(self) -> None:
         """Test that the generated HTML contains expected structure."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "report.html"
-            image = _create_test_image(size=(50, 80))
-            
-            save_html(image, output_path, title="Test Mosaic")
-            content = output_path.read_text(encoding="utf-8")
-            
-            self.assertIn("<!DOCTYPE html>", content)
-            self.assertIn("<title>Test Mosaic</title>", content)
-            self.assertIn("data:image/png;base64,", content)
-            self.assertIn("80", content)  # width
-            self.assertIn("50", content)  # height
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "report.html"
+        image = create_test_image(size=(50, 80))
+        
+        save_html(image, output_path, title="Test Mosaic")
+        content = output_path.read_text(encoding="utf-8")
+        
+        self.assertIn("<!DOCTYPE html>", content)
+        self.assertIn("<title>Test Mosaic</title>", content)
+        self.assertIn("data:image/png;base64,", content)
+        self.assertIn("80", content)  # width
+        self.assertIn("50", content)  # height
+    
+    def test_save_html_image_round_trips(self) -> None:
+        """Test that the chunked base64 payload decodes back to the image."""
+        temp_dir = self._temp_dir()
+        output_path = Path(temp_dir) / "report.html"
+        image = create_test_image(size=(50, 80))
+        
+        # A tiny chunk size exercises many chunk boundaries
+        with patch("autoflight.output._BASE64_CHUNK_BYTES", 3):
+            save_html(image, output_path)
+        content = output_path.read_text(encoding="utf-8")
+        
+        match = re.search(r'data:image/png;base64,([A-Za-z0-9+/=]+)"', content)
+        self.assertIsNotNone(match)
+        png = np.frombuffer(base64.b64decode(match.group(1)), dtype=np.uint8)
+        np.testing.assert_array_equal(cv2.imdecode(png, cv2.IMREAD_COLOR), image)
+    
+    def test_save_html_jpeg(self) -> None:
+        """Test embedding the image as JPEG instead of PNG."""
+        temp_dir = self._temp_dir()
+        output_path = Path(temp_dir) / "report.html"
+        
+        save_html(create_test_image(size=(50, 80)), output_path, image_format="jpeg")
+        content = output_path.read_text(encoding="utf-8")
+        
+        match = re.search(r'data:image/jpeg;base64,([A-Za-z0-9+/=]+)"', content)
+        self.assertIsNotNone(match)
+        jpeg = np.frombuffer(base64.b64decode(match.group(1)), dtype=np.uint8)
+        self.assertEqual(cv2.imdecode(jpeg, cv2.IMREAD_COLOR).shape, (50, 80, 3))
+    
+    def test_save_html_invalid_format_fails(self) -> None:
+        """Test that unsupported embedded formats are rejected."""
+        temp_dir = self._temp_dir()
+        with self.assertRaises(ValidationError):
+            save_html(create_test_image(), Path(temp_dir) / "r.html", image_format="gif")
+    
+    def test_save_png_and_html_share_encoding(self) -> None:
+        """Test that a precomputed PNG is reused by both writers."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image = create_test_image(size=(50, 80))
+        png = encode_png(image)
+        
+        with patch("cv2.imencode") as imencode, patch("cv2.imwrite") as imwrite:
+            save_image(image, temp_path / "mosaic.png", precomputed_png=png)
+            save_html(image, temp_path / "report.html", precomputed_png=png)
+        imencode.assert_not_called()
+        imwrite.assert_not_called()
+        
+        self.assertEqual((temp_path / "mosaic.png").read_bytes(), png)
+        content = (temp_path / "report.html").read_text(encoding="utf-8")
+        self.assertIn(base64.b64encode(png).decode("ascii"), content)
+    
+    def test_save_html_uses_pybase64(self) -> None:
+        """Test that pybase64 is used for the payload when installed."""
+        temp_dir = self._temp_dir()
+        output_path = Path(temp_dir) / "report.html"
+        fake_pybase64 = MagicMock()
+        fake_pybase64.b64encode.side_effect = base64.b64encode
+        
+        with patch.dict(sys.modules, {"pybase64": fake_pybase64}):
+            save_html(create_test_image(), output_path)
+        
+        fake_pybase64.b64encode.assert_called()
+        self.assertIn("data:image/png;base64,", output_path.read_text(encoding="utf-8"))
     
     def test_save_html_creates_dirs(self) -> None:
         """Test that save_html creates parent directories."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "subdir" / "report.html"
-            image = _create_test_image()
-            
-            save_html(image, output_path, create_dirs=True)
-            self.assertTrue(output_path.exists())
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "subdir" / "report.html"
+        image = create_test_image()
+        
+        save_html(image, output_path, create_dirs=True)
+        self.assertTrue(output_path.exists())
     
     def test_save_html_no_create_dirs_fails(self) -> None:
         """Test that save_html fails when parent dir is missing and create_dirs is False."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "nonexistent" / "report.html"
-            image = _create_test_image()
-            
-            with self.assertRaises(ValidationError):
-                save_html(image, output_path, create_dirs=False)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "nonexistent" / "report.html"
+        image = create_test_image()
+        
+        with self.assertRaises(ValidationError):
+            save_html(image, output_path, create_dirs=False)
     
     def test_save_html_empty_image_fails(self) -> None:
         """Test that save_html raises ValidationError for empty/None image."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "report.html"
-            
-            with self.assertRaises(ValidationError):
-                save_html(None, output_path)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "report.html"
+        
+        with self.assertRaises(ValidationError):
+            save_html(None, output_path)
     
     def test_save_html_title_escaped(self) -> None:
         """Test that HTML special characters in title are escaped."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            output_path = temp_path / "report.html"
-            image = _create_test_image()
-            
-            save_html(image, output_path, title="<script>alert('xss')</script>")
-            content = output_path.read_text(encoding="utf-8")
-            
-            self.assertNotIn("<script>", content)
-            self.assertIn("&lt;script&gt;", content)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        output_path = temp_path / "report.html"
+        image = create_test_image()
+        
+        save_html(image, output_path, title="<script>alert('xss')</script>")
+        content = output_path.read_text(encoding="utf-8")
+        
+        self.assertNotIn("<script>", content)
+        self.assertIn("&lt;script&gt;", content)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,19 @@
 """Tests for the new modules: security, config, cli, and exceptions."""
 
+import functools
+import io
 import os
-import tempfile
+import subprocess
+import sys
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-import cv2
 import numpy as np
 
+from _fixtures import TempDirTestCase, create_test_image, write_image
+from autoflight import __version__
+from autoflight.cli import config_from_args, create_parser, main, print_progress, run
 from autoflight.exceptions import (
     AutoflightError,
     ImageLoadError,
@@ -23,7 +28,11 @@ from autoflight.security import (
     validate_image_dimensions,
     validate_file_count,
     validate_path_security,
+    validate_paths,
+    validate_image_file,
+    validate_image_directory,
     get_default_limits,
+    PathValidator,
 )
 from autoflight.config import (
     AutoflightConfig,
@@ -35,17 +44,6 @@ from autoflight.config import (
 )
 
 
-def _write_image(path: Path, image: np.ndarray) -> None:
-    """Helper to write test images."""
-    cv2.imwrite(str(path), image)
-
-
-def _create_test_image(size=(100, 100), seed=0) -> np.ndarray:
-    """Create a test image."""
-    rng = np.random.default_rng(seed)
-    return rng.integers(0, 255, size=(*size, 3), dtype=np.uint8)
-
-
 class TestExceptions(unittest.TestCase):
     """Tests for custom exceptions."""
     
@@ -88,30 +86,39 @@ class TestSecurityLimits(unittest.TestCase):
         self.assertEqual(limits.max_files, 10)
 
 
-class TestSecurityValidation(unittest.TestCase):
+class TestSecurityValidation(TempDirTestCase):
     """Tests for security validation functions."""
     
     def test_validate_file_size_passes(self) -> None:
         """Test file size validation passes for small files."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            image_path = temp_path / "test.jpg"
-            _write_image(image_path, _create_test_image())
-            
-            # Should not raise
-            validate_file_size(image_path)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image_path = temp_path / "test.jpg"
+        write_image(image_path, create_test_image())
+        
+        # Should not raise
+        validate_file_size(image_path)
     
     def test_validate_file_size_fails(self) -> None:
         """Test file size validation fails for oversized files."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            image_path = temp_path / "test.jpg"
-            _write_image(image_path, _create_test_image())
-            
-            # Use very small limit
-            limits = SecurityLimits(max_file_size=10)
-            with self.assertRaises(SecurityError):
-                validate_file_size(image_path, limits=limits)
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        image_path = temp_path / "test.jpg"
+        write_image(image_path, create_test_image())
+        
+        # Use very small limit
+        limits = SecurityLimits(max_file_size=10)
+        with self.assertRaises(SecurityError):
+            validate_file_size(image_path, limits=limits)
+    
+    def test_validate_file_size_uses_known_size(self) -> None:
+        """Test that a caller-supplied size is checked without a stat."""
+        limits = SecurityLimits(max_file_size=10)
+        missing = Path("/nonexistent/image.jpg")
+        
+        validate_file_size(missing, limits=limits, file_size=5)
+        with self.assertRaises(SecurityError):
+            validate_file_size(missing, limits=limits, file_size=50)
     
     def test_validate_image_dimensions_passes(self) -> None:
         """Test image dimension validation passes for small images."""
@@ -135,35 +142,156 @@ class TestSecurityValidation(unittest.TestCase):
     
     def test_validate_path_security_normal_path(self) -> None:
         """Test path security validation passes for normal paths."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            resolved = validate_path_security(temp_path)
-            self.assertEqual(resolved, temp_path.resolve())
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        resolved = validate_path_security(temp_path)
+        self.assertEqual(resolved, temp_path.resolve())
     
     def test_validate_path_security_with_base_dir(self) -> None:
         """Test path security validation with base directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            base_path = Path(temp_dir)
-            subdir = base_path / "subdir"
-            subdir.mkdir()
-            
-            # Should pass for paths within base
-            resolved = validate_path_security(subdir, base_dir=base_path)
-            self.assertEqual(resolved, subdir.resolve())
+        temp_dir = self._temp_dir()
+        base_path = Path(temp_dir)
+        subdir = base_path / "subdir"
+        subdir.mkdir()
+        
+        # Should pass for paths within base
+        resolved = validate_path_security(subdir, base_dir=base_path)
+        self.assertEqual(resolved, subdir.resolve())
     
     def test_validate_path_security_traversal_detected(self) -> None:
         """Test path security validation detects path traversal."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            base_path = Path(temp_dir) / "base"
-            base_path.mkdir()
-            
-            # Create a path outside base
-            outside_path = Path(temp_dir) / "outside"
-            outside_path.mkdir()
-            
-            # Should fail for paths outside base
+        temp_dir = self._temp_dir()
+        base_path = Path(temp_dir) / "base"
+        base_path.mkdir()
+        
+        # Create a path outside base
+        outside_path = Path(temp_dir) / "outside"
+        outside_path.mkdir()
+        
+        # Should fail for paths outside base
+        with self.assertRaises(SecurityError):
+            validate_path_security(outside_path, base_dir=base_path)
+    
+    def test_validate_path_security_rejects_symlink(self) -> None:
+        """Test that a symlink is rejected before it is resolved."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        target = temp_path / "target.jpg"
+        target.write_bytes(b"data")
+        link = temp_path / "link.jpg"
+        try:
+            link.symlink_to(target)
+        except (OSError, NotImplementedError):
+            self.skipTest("Symlinks not supported")
+        
+        with patch.object(Path, "resolve") as resolve:
+            with self.assertRaises(SecurityError):
+                validate_path_security(link)
+        resolve.assert_not_called()
+        
+        with self.assertRaises(SecurityError):
+            validate_image_file(link)
+    
+    def test_validate_paths_batch(self) -> None:
+        """Test batch validation resolves the base once and keeps order."""
+        temp_dir = self._temp_dir()
+        base_path = Path(temp_dir)
+        first = base_path / "a.jpg"
+        second = base_path / "b.jpg"
+        
+        with patch.object(Path, "resolve", autospec=True, side_effect=Path.absolute) as resolve:
+            resolved = validate_paths([first, second, first], base_dir=base_path)
+        
+        self.assertEqual(resolved, [first, second, first])
+        # Base once, plus one per distinct path
+        self.assertEqual(resolve.call_count, 3)
+    
+    def test_validate_paths_traversal_detected(self) -> None:
+        """Test batch validation rejects paths outside the base."""
+        temp_dir = self._temp_dir()
+        base_path = Path(temp_dir) / "base"
+        base_path.mkdir()
+        
+        paths = [base_path / "ok.jpg", base_path / ".." / "escape.jpg"]
+        with self.assertRaises(SecurityError):
+            validate_paths(paths, base_dir=base_path)
+    
+    def test_path_validator(self) -> None:
+        """Test that PathValidator resolves the base once and checks containment."""
+        temp_dir = self._temp_dir()
+        base_path = Path(temp_dir) / "base"
+        base_path.mkdir()
+        sibling = Path(temp_dir) / "base2"
+        sibling.mkdir()
+        
+        base_resolved = base_path.resolve()
+        with patch.object(Path, "resolve", autospec=True, side_effect=Path.resolve) as resolve:
+            validator = PathValidator(base_path)
+            self.assertEqual(validator.validate(base_path / "a.jpg"), base_resolved / "a.jpg")
+            self.assertEqual(validator.validate(base_path), base_resolved)
+        resolve.assert_called_once()
+        
+        for path in [base_path / ".." / "escape.jpg", sibling / "a.jpg"]:
             with self.assertRaises(SecurityError):
-                validate_path_security(outside_path, base_dir=base_path)
+                validator.validate(path)
+    
+    def test_validate_image_file_dimensions_from_header(self) -> None:
+        """Test that dimension checks read headers instead of decoding."""
+        import cv2
+        
+        image = np.zeros((20, 30, 3), dtype=np.uint8)
+        limits = SecurityLimits(max_image_pixels=500)
+        temp_dir = self._temp_dir()
+        for ext in (".png", ".jpg", ".tif"):
+            path = Path(temp_dir) / f"image{ext}"
+            cv2.imwrite(str(path), image)
+            with patch("cv2.imread") as imread:
+                validate_image_file(path, check_dimensions=True)
+                with self.assertRaises(SecurityError):
+                    validate_image_file(path, limits=limits, check_dimensions=True)
+            imread.assert_not_called()
+        
+        # Unrecognised formats are still checked by decoding
+        path = Path(temp_dir) / "image.bmp"
+        cv2.imwrite(str(path), image)
+        with self.assertRaises(SecurityError):
+            validate_image_file(path, limits=limits, check_dimensions=True)
+    
+    def test_validate_image_file_dir_entry(self) -> None:
+        """Test that a DirEntry is validated without resolving its path."""
+        temp_dir = self._temp_dir()
+        (Path(temp_dir) / "a.jpg").write_bytes(b"x" * 100)
+        with os.scandir(temp_dir) as it:
+            entry = next(it)
+        
+        with patch.object(Path, "resolve") as resolve:
+            validate_image_file(entry)
+        resolve.assert_not_called()
+        
+        with self.assertRaises(SecurityError):
+            validate_image_file(entry, limits=SecurityLimits(max_file_size=10))
+    
+    def test_validate_image_directory(self) -> None:
+        """Test directory validation filters, sorts and applies limits."""
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
+        for name in ["b.jpg", "a.png", "notes.txt"]:
+            (temp_path / name).write_bytes(b"data")
+        (temp_path / "sub").mkdir()
+        
+        paths = validate_image_directory(temp_path, extensions=[".jpg", ".png"])
+        self.assertEqual(paths, [temp_path / "a.png", temp_path / "b.jpg"])
+        
+        with self.assertRaises(SecurityError):
+            validate_image_directory(temp_path, limits=SecurityLimits(max_files=2))
+        
+        link = temp_path / "link.jpg"
+        try:
+            link.symlink_to(temp_path / "b.jpg")
+        except (OSError, NotImplementedError):
+            return
+        with self.assertRaises(SecurityError):
+            validate_image_directory(temp_path, extensions=[".jpg"])
 
 
 class TestConfig(unittest.TestCase):
@@ -175,6 +303,7 @@ class TestConfig(unittest.TestCase):
         self.assertTrue(config.parallel_loading)
         self.assertEqual(config.max_workers, 4)
         self.assertIsNone(config.memory_limit_mb)
+        self.assertFalse(config.use_processes)
     
     def test_output_config_defaults(self) -> None:
         """Test OutputConfig default values."""
@@ -236,6 +365,16 @@ class TestConfig(unittest.TestCase):
         self.assertIsNone(config.progress_callback)
         self.assertEqual(new_config.progress_callback, callback)
     
+    def test_config_is_immutable(self) -> None:
+        """Test that configuration objects cannot be mutated in place."""
+        import dataclasses
+        
+        config = AutoflightConfig()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.verbose = True
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.performance.max_workers = 8
+    
     def test_get_and_set_default_config(self) -> None:
         """Test getting and setting default config."""
         original = get_default_config()
@@ -249,45 +388,94 @@ class TestConfig(unittest.TestCase):
         set_default_config(original)
 
 
-class TestCLI(unittest.TestCase):
+@functools.lru_cache(maxsize=1)
+def _cli_parser():
+    """Build the CLI parser once; parse_args does not modify it."""
+    return create_parser()
+
+
+class TestCLI(TempDirTestCase):
     """Tests for CLI module."""
     
     def test_cli_help(self) -> None:
         """Test CLI --help output."""
-        from autoflight.cli import create_parser
-        
-        parser = create_parser()
-        # Should not raise
-        with self.assertRaises(SystemExit) as ctx:
-            parser.parse_args(["--help"])
+        parser = _cli_parser()
+        # Capture the help text instead of writing it to the test runner's stdout
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaises(SystemExit) as ctx:
+                parser.parse_args(["--help"])
+        self.assertEqual(ctx.exception.code, 0)
+        self.assertIn("usage:", stdout.getvalue())
+    
+    def test_cli_version(self) -> None:
+        """Test CLI --version output."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaises(SystemExit) as ctx:
+                main(["--version"])
         self.assertEqual(ctx.exception.code, 0)
+        self.assertIn(__version__, stdout.getvalue())
+    
+    def test_cli_help_skips_heavy_imports(self) -> None:
+        """Test that --help does not import OpenCV, the loader, or the dependency check."""
+        code = (
+            "import sys\n"
+            "from autoflight.cli import main\n"
+            "try:\n"
+            "    main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "loaded = [m for m in ('cv2', 'autoflight._ensure_deps', 'autoflight.image_loader')\n"
+            "          if m in sys.modules]\n"
+            "print(loaded, file=sys.stderr)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stderr.strip(), "[]")
+    
+    def test_cli_import_is_light(self) -> None:
+        """Test that importing the CLI does not import config or security modules."""
+        code = (
+            "import sys\n"
+            "import autoflight.cli\n"
+            "print([m for m in ('autoflight.config', 'autoflight.security') if m in sys.modules])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.strip(), "[]")
+    
+    def test_print_progress(self) -> None:
+        """Test progress bar rendering and duplicate suppression."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            print_progress(0.5, "Halfway")
+            print_progress(0.5, "Halfway")
+            print_progress(1.0, "Done")
+        output = stdout.getvalue()
+        self.assertEqual(output.count("Halfway"), 1)
+        self.assertIn("█" * 20 + "░" * 20 + "] 50% - Halfway", output)
+        self.assertTrue(output.endswith("█" * 40 + "] 100% - Done\n"))
     
     def test_cli_dry_run(self) -> None:
         """Test CLI dry-run mode."""
-        from autoflight.cli import run
+        temp_dir = self._temp_dir()
+        temp_path = Path(temp_dir)
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            result = run([str(temp_path), "output.jpg", "--dry-run"])
-            self.assertEqual(result, 0)
+        result = run([str(temp_path), "output.jpg", "--dry-run"])
+        self.assertEqual(result, 0)
     
     def test_cli_dry_run_nonexistent(self) -> None:
         """Test CLI dry-run mode with non-existent directory."""
-        from autoflight.cli import run
-        
         result = run(["/nonexistent/path", "output.jpg", "--dry-run"])
         self.assertEqual(result, 1)
     
     def test_cli_config_from_args(self) -> None:
         """Test config_from_args creates proper config."""
-        from autoflight.cli import create_parser, config_from_args
-        
-        parser = create_parser()
+        parser = _cli_parser()
         args = parser.parse_args([
             "/input", "output.jpg",
             "--mode", "scans",
+            "--gpu",
             "--no-parallel",
+            "--processes",
             "--quality", "80",
             "--verbose",
         ])
@@ -295,7 +483,9 @@ class TestCLI(unittest.TestCase):
         config = config_from_args(args)
         
         self.assertFalse(config.performance.parallel_loading)
+        self.assertTrue(config.performance.use_processes)
         self.assertEqual(config.stitching.mode, "scans")
+        self.assertTrue(config.stitching.try_use_gpu)
         self.assertEqual(config.output.jpeg_quality, 80)
         self.assertTrue(config.verbose)
 
@@ -1,77 +1,115 @@
 """Tests for the autoflight web server."""
 
 import base64
+import gzip
+import http.client
+import io
 import json
+import socket
+import subprocess
+import sys
 import tempfile
 import threading
 import unittest
-from http.server import HTTPServer
+from http.server import ThreadingHTTPServer
 from pathlib import Path
-from urllib import request as urllib_request
-from urllib.error import URLError
+from typing import Optional
+from unittest.mock import patch
 
 import cv2
 import numpy as np
 
-from autoflight.server import _AutoflightHandler, _WEB_DIR, run_server
+from _fixtures import create_test_image, image_to_b64
+from autoflight.cli import _sniff_subcommand, create_serve_parser, main, run_serve
+from autoflight.security import SecurityLimits
+from autoflight.server import (
+    _AutoflightHandler,
+    _AutoflightHTTPServer,
+    _WEB_DIR,
+    _parse_multipart,
+    run_server,
+)
 
 
-def _create_test_image(size=(100, 100), seed=0) -> np.ndarray:
-    """Create a small deterministic test image."""
-    rng = np.random.default_rng(seed)
-    return rng.integers(0, 255, size=(*size, 3), dtype=np.uint8)
+# Request bodies carry large base64 strings; use orjson when it is installed
+try:
+    from orjson import dumps as _dumps
+    from orjson import loads as _loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
 
+    _loads = json.loads
 
-def _image_to_b64(img: np.ndarray) -> str:
-    """Encode an ndarray image to a base64 PNG string."""
-    ok, buf = cv2.imencode(".png", img)
-    assert ok
-    return "data:image/png;base64," + base64.b64encode(buf).decode("ascii")
+
+_SHARED_SERVER: Optional[ThreadingHTTPServer] = None
+
+
+def setUpModule() -> None:
+    """Start one test HTTP server for every server test class."""
+    global _SHARED_SERVER
+    _SHARED_SERVER = ThreadingHTTPServer(("localhost", 0), _AutoflightHandler)
+    threading.Thread(target=_SHARED_SERVER.serve_forever, daemon=True).start()
+
+
+def tearDownModule() -> None:
+    global _SHARED_SERVER
+    if _SHARED_SERVER is not None:
+        _SHARED_SERVER.shutdown()
+        _SHARED_SERVER.server_close()
+        _SHARED_SERVER = None
 
 
 class _ServerTestCase(unittest.TestCase):
-    """Base class that starts and tears down a test HTTP server."""
+    """Base class for tests against the module's shared test HTTP server."""
 
-    server: HTTPServer
+    server: ThreadingHTTPServer
     port: int
     base_url: str
 
     @classmethod
     def setUpClass(cls) -> None:
-        cls.server = HTTPServer(("localhost", 0), _AutoflightHandler)
+        assert _SHARED_SERVER is not None
+        cls.server = _SHARED_SERVER
         cls.port = cls.server.server_address[1]
         cls.base_url = f"http://localhost:{cls.port}"
-        cls._thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
-        cls._thread.start()
+        # One keep-alive connection per thread that makes requests
+        cls._local = threading.local()
+        cls._connections = []
 
     @classmethod
     def tearDownClass(cls) -> None:
-        cls.server.shutdown()
-        cls.server.server_close()
+        for conn in cls._connections:
+            conn.close()
+
+    def _request(self, method: str, path: str, body: Optional[bytes] = None, headers=None):
+        """Send a request on this thread's persistent connection.
+
+        Returns (status, headers, body_bytes).
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection("localhost", self.port, timeout=30)
+            self._local.conn = conn
+            self._connections.append(conn)
+        conn.request(method, path, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        # Reading the whole body frees the connection for the next request;
+        # http.client reconnects by itself after a "Connection: close"
+        return resp.status, resp.headers, resp.read()
 
     def _get(self, path: str):
         """Make a GET request and return (status, body_bytes)."""
-        req = urllib_request.Request(self.base_url + path)
-        try:
-            with urllib_request.urlopen(req) as resp:
-                return resp.status, resp.read()
-        except urllib_request.HTTPError as e:
-            return e.code, e.read()
+        status, _, body = self._request("GET", path)
+        return status, body
 
     def _post_json(self, path: str, payload: dict):
         """Make a POST request with JSON body and return (status, parsed_json)."""
-        body = json.dumps(payload).encode("utf-8")
-        req = urllib_request.Request(
-            self.base_url + path,
-            data=body,
-            headers={"Content-Type": "application/json"},
-            method="POST",
+        body = _dumps(payload)
+        status, _, data = self._request(
+            "POST", path, body, {"Content-Type": "application/json"}
         )
-        try:
-            with urllib_request.urlopen(req) as resp:
-                return resp.status, json.loads(resp.read())
-        except urllib_request.HTTPError as e:
-            return e.code, json.loads(e.read())
+        return status, _loads(data)
 
 
 class TestServerGet(_ServerTestCase):
@@ -93,6 +131,48 @@ class TestServerGet(_ServerTestCase):
         status, _ = self._get("/nonexistent")
         self.assertEqual(status, 404)
 
+    def test_get_root_gzip(self) -> None:
+        """Clients accepting gzip get the precompressed page."""
+        _, headers, body = self._request("GET", "/", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), (_WEB_DIR / "index.html").read_bytes())
+
+    def test_get_root_served_from_memory(self) -> None:
+        """The page is not read from disk per request."""
+        with patch.object(Path, "read_bytes") as read_bytes:
+            status, _ = self._get("/")
+        self.assertEqual(status, 200)
+        read_bytes.assert_not_called()
+
+    def test_connection_kept_alive(self) -> None:
+        """Several requests can share one HTTP/1.1 connection."""
+        conn = http.client.HTTPConnection("localhost", self.port)
+        try:
+            for _ in range(3):
+                conn.request("GET", "/")
+                resp = conn.getresponse()
+                self.assertEqual(resp.status, 200)
+                self.assertEqual(resp.version, 11)
+                resp.read()
+                self.assertFalse(resp.will_close)
+        finally:
+            conn.close()
+
+    def test_idle_connection_closed(self) -> None:
+        """A kept-alive connection that goes quiet is closed by the server."""
+        self.assertIsNotNone(_AutoflightHandler.timeout)
+        received = b""
+        with patch.object(_AutoflightHandler, "timeout", 0.2), \
+                socket.create_connection(("localhost", self.port), timeout=10) as sock:
+            sock.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            # Read the response, then wait for the server to hang up
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                received += chunk
+        self.assertTrue(received.startswith(b"HTTP/1.1 200"))
+
 
 class TestServerStitchApi(_ServerTestCase):
     """Tests for POST /api/stitch."""
@@ -104,28 +184,44 @@ class TestServerStitchApi(_ServerTestCase):
         self.assertIn("No images", data["error"])
 
     def test_stitch_invalid_json_returns_400(self) -> None:
-        req = urllib_request.Request(
-            self.base_url + "/api/stitch",
-            data=b"not-json",
-            headers={"Content-Type": "application/json"},
-            method="POST",
+        status, _, body = self._request(
+            "POST", "/api/stitch", b"not-json", {"Content-Type": "application/json"}
         )
-        try:
-            with urllib_request.urlopen(req) as resp:
-                status = resp.status
-                data = json.loads(resp.read())
-        except urllib_request.HTTPError as e:
-            status = e.code
-            data = json.loads(e.read())
         self.assertEqual(status, 400)
-        self.assertFalse(data["success"])
+        self.assertFalse(_loads(body)["success"])
+
+    def test_stitch_empty_body_returns_400(self) -> None:
+        """A request without a body is rejected from its headers."""
+        conn = http.client.HTTPConnection("localhost", self.port)
+        try:
+            conn.request("POST", "/api/stitch", headers={"Content-Length": "0"})
+            resp = conn.getresponse()
+            data = _loads(resp.read())
+        finally:
+            conn.close()
+        self.assertEqual(resp.status, 400)
+        self.assertIn("No images", data["error"])
+
+    def test_stitch_negative_content_length_returns_400(self) -> None:
+        """A negative Content-Length is refused instead of reading to EOF."""
+        conn = http.client.HTTPConnection("localhost", self.port)
+        try:
+            conn.putrequest("POST", "/api/stitch")
+            conn.putheader("Content-Length", "-1")
+            conn.endheaders()
+            resp = conn.getresponse()
+            resp.read()
+        finally:
+            conn.close()
+        self.assertEqual(resp.status, 400)
+        self.assertTrue(resp.will_close)
 
     def test_stitch_single_image_returns_ok(self) -> None:
         """A single image should be returned unchanged (no stitching needed)."""
-        img = _create_test_image(size=(50, 80), seed=1)
+        img = create_test_image(size=(50, 80), seed=1)
         status, data = self._post_json(
             "/api/stitch",
-            {"images": [_image_to_b64(img)], "mode": "panorama"},
+            {"images": [image_to_b64(img)], "mode": "panorama"},
         )
         self.assertEqual(status, 200)
         self.assertTrue(data["success"])
@@ -136,10 +232,10 @@ class TestServerStitchApi(_ServerTestCase):
 
     def test_stitch_result_is_valid_png(self) -> None:
         """The returned base64 string should decode to a valid PNG."""
-        img = _create_test_image(size=(60, 60), seed=2)
+        img = create_test_image(size=(60, 60), seed=2)
         _, data = self._post_json(
             "/api/stitch",
-            {"images": [_image_to_b64(img)], "mode": "panorama"},
+            {"images": [image_to_b64(img)], "mode": "panorama"},
         )
         raw = base64.b64decode(data["image"])
         arr = np.frombuffer(raw, dtype=np.uint8)
@@ -148,11 +244,200 @@ class TestServerStitchApi(_ServerTestCase):
         self.assertEqual(decoded.shape[0], 60)
         self.assertEqual(decoded.shape[1], 60)
 
+    def _post_for_png(self, path: str, payload: dict, accept: str = "image/png"):
+        """POST JSON asking for a binary reply; return (status, headers, body)."""
+        return self._request(
+            "POST",
+            path,
+            _dumps(payload),
+            {"Content-Type": "application/json", "Accept": accept},
+        )
+
+    def test_stitch_binary_response_via_accept(self) -> None:
+        """``Accept: image/png`` returns the raw PNG with size headers."""
+        img = create_test_image(size=(40, 70), seed=3)
+        status, headers, body = self._post_for_png(
+            "/api/stitch", {"images": [image_to_b64(img)]}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], "image/png")
+        self.assertEqual(headers["X-Image-Width"], "70")
+        self.assertEqual(headers["X-Image-Height"], "40")
+        self.assertEqual(headers["X-Image-Count"], "1")
+        decoded = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+        np.testing.assert_array_equal(decoded, img)
+
+    def test_stitch_binary_response_via_query(self) -> None:
+        """``?format=binary`` selects the raw PNG regardless of Accept."""
+        img = create_test_image(size=(30, 30), seed=4)
+        _, headers, body = self._post_for_png(
+            "/api/stitch?format=binary", {"images": [image_to_b64(img)]}, accept="*/*"
+        )
+        self.assertEqual(headers["Content-Type"], "image/png")
+        self.assertTrue(body.startswith(b"\x89PNG"))
+
+    def test_stitch_binary_errors_stay_json(self) -> None:
+        """Failures are still reported as JSON when a PNG was requested."""
+        status, headers, body = self._post_for_png("/api/stitch", {"images": []})
+        self.assertEqual(status, 400)
+        self.assertTrue(headers["Content-Type"].startswith("application/json"))
+        self.assertFalse(_loads(body)["success"])
+
+    def _post_multipart(self, path: str, files: list, fields: dict):
+        """POST a multipart/form-data body and return (status, parsed_json)."""
+        boundary = "autoflight-test-boundary"
+        chunks = []
+        for name, value in fields.items():
+            chunks.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                f"{value}\r\n".encode("utf-8")
+            )
+        for i, data in enumerate(files):
+            chunks.append(
+                f"--{boundary}\r\nContent-Disposition: form-data; name=\"images\"; "
+                f'filename="img{i}.png"\r\nContent-Type: image/png\r\n\r\n'.encode("utf-8")
+                + data
+                + b"\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n".encode("utf-8"))
+        status, _, body = self._request(
+            "POST",
+            path,
+            b"".join(chunks),
+            {"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+        return status, _loads(body)
+
+    def test_stitch_multipart_upload(self) -> None:
+        """Binary multipart parts are decoded without a base64 step."""
+        img = create_test_image(size=(45, 55), seed=5)
+        ok, buf = cv2.imencode(".png", img)
+        self.assertTrue(ok)
+        status, data = self._post_multipart(
+            "/api/stitch", [buf.tobytes()], {"mode": "panorama"}
+        )
+        self.assertEqual(status, 200)
+        self.assertTrue(data["success"])
+        self.assertEqual((data["width"], data["height"]), (55, 45))
+
+    def test_stitch_multipart_without_files_returns_400(self) -> None:
+        status, data = self._post_multipart("/api/stitch", [], {"mode": "panorama"})
+        self.assertEqual(status, 400)
+        self.assertIn("No images", data["error"])
+
+    def test_stitch_multipart_unknown_charset_returns_400(self) -> None:
+        body = (
+            b"--b\r\nContent-Disposition: form-data; name=\"mode\"\r\n"
+            b"Content-Type: text/plain; charset=no-such-charset\r\n\r\npanorama\r\n--b--\r\n"
+        )
+        status, _, data = self._request(
+            "POST", "/api/stitch", body, {"Content-Type": "multipart/form-data; boundary=b"}
+        )
+        self.assertEqual(status, 400)
+        self.assertIn("charset", _loads(data)["error"])
+
+    def test_stitch_too_many_images_returns_413(self) -> None:
+        """The file-count limit is applied before any upload is decoded."""
+        limits = SecurityLimits(max_files=1)
+        with patch("autoflight.server.get_default_limits", return_value=limits), patch(
+            "autoflight.server._decode_upload"
+        ) as decode:
+            status, data = self._post_json("/api/stitch", {"images": ["AAAA", "AAAA"]})
+        self.assertEqual(status, 413)
+        self.assertFalse(data["success"])
+        decode.assert_not_called()
+
+    def test_stitch_oversized_image_returns_413(self) -> None:
+        """An upload whose decoded size exceeds the limit is never decoded."""
+        limits = SecurityLimits(max_file_size=1000)
+        payload = {"images": [image_to_b64(create_test_image()), "A" * 2000]}
+        with patch("autoflight.server.get_default_limits", return_value=limits), patch(
+            "autoflight.server._decode_upload"
+        ) as decode:
+            status, data = self._post_json("/api/stitch", payload)
+        self.assertEqual(status, 413)
+        self.assertIn("Image 1", data["error"])
+        decode.assert_not_called()
+
+    def test_stitch_oversized_body_returns_413(self) -> None:
+        """Bodies larger than the limits allow are refused unread."""
+        limits = SecurityLimits(max_file_size=10, max_files=1)
+        with patch("autoflight.server.get_default_limits", return_value=limits):
+            status, data = self._post_json("/api/stitch", {"images": ["A" * 100]})
+        self.assertEqual(status, 413)
+        self.assertEqual(data["error"], "Request body too large")
+
+    def test_stitch_body_over_request_cap_returns_413(self) -> None:
+        """The server's request size cap applies whatever the file limits."""
+        with patch.object(self.server, "max_request_size", 50, create=True):
+            status, data = self._post_json("/api/stitch", {"images": ["A" * 100]})
+        self.assertEqual(status, 413)
+        self.assertEqual(data["error"], "Request body too large")
+
+    def test_read_body_grows_with_received_data(self) -> None:
+        """A large Content-Length is not allocated before the data arrives."""
+        handler = _AutoflightHandler.__new__(_AutoflightHandler)
+        handler.rfile = io.BytesIO(b"abc")
+        with self.assertRaises(ConnectionError):
+            handler._read_body(1_500_000_000)
+        handler.rfile = io.BytesIO(b"abcdef")
+        self.assertEqual(handler._read_body(6), bytearray(b"abcdef"))
+
+    def test_stitch_undecodable_image_reports_index(self) -> None:
+        """A bad upload is reported by its position in the request."""
+        garbage = base64.b64encode(b"not an image").decode("ascii")
+        status, data = self._post_json(
+            "/api/stitch",
+            {"images": [image_to_b64(create_test_image()), garbage]},
+        )
+        self.assertEqual(status, 400)
+        self.assertFalse(data["success"])
+        self.assertIn("image 2", data["error"])
+
+    def test_get_not_blocked_by_running_stitch(self) -> None:
+        """A slow stitch must not stall other requests."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_stitch(images, **kwargs):
+            started.set()
+            release.wait(10)
+            return images[0]
+
+        payload = {"images": [image_to_b64(create_test_image())]}
+        with patch("autoflight.server.stitch_images", side_effect=slow_stitch):
+            worker = threading.Thread(target=self._post_json, args=("/api/stitch", payload))
+            worker.start()
+            try:
+                self.assertTrue(started.wait(10))
+                status, _ = self._get("/")
+                self.assertEqual(status, 200)
+            finally:
+                release.set()
+                worker.join(10)
+
     def test_stitch_unknown_endpoint_returns_404(self) -> None:
         status, data = self._post_json("/api/unknown", {})
         self.assertEqual(status, 404)
 
 
+class TestServerSocket(unittest.TestCase):
+    """Tests for the listening and connection socket options."""
+
+    @unittest.skipUnless(hasattr(socket, "SO_REUSEPORT"), "SO_REUSEPORT not supported")
+    def test_reuse_port_allows_second_server(self) -> None:
+        first = _AutoflightHTTPServer(("localhost", 0), _AutoflightHandler, reuse_port=True)
+        try:
+            port = first.server_address[1]
+            second = _AutoflightHTTPServer(("localhost", port), _AutoflightHandler, reuse_port=True)
+            second.server_close()
+        finally:
+            first.server_close()
+
+    def test_handler_disables_nagle(self) -> None:
+        self.assertTrue(_AutoflightHandler.disable_nagle_algorithm)
+
+
 class TestServerModule(unittest.TestCase):
     """Tests for server module-level attributes."""
 
@@ -162,6 +447,26 @@ class TestServerModule(unittest.TestCase):
     def test_index_html_exists(self) -> None:
         self.assertTrue((_WEB_DIR / "index.html").exists())
 
+    def test_parse_multipart_returns_views_into_body(self) -> None:
+        body = bytearray(
+            b"preamble\r\n--b\r\n"
+            b'Content-Disposition: form-data; name="images"; filename="a.png"\r\n\r\n'
+            b"\x89PNG\r\n--b-not-a-delimiter\r\n"
+            b'--b\r\nContent-Disposition: form-data; name="mode"\r\n\r\nscans\r\n'
+            b"--b--\r\nepilogue"
+        )
+        files, fields = _parse_multipart('multipart/form-data; boundary="b"', body)
+        self.assertEqual([bytes(f) for f in files], [b"\x89PNG\r\n--b-not-a-delimiter"])
+        self.assertIsInstance(files[0], memoryview)
+        self.assertEqual(fields, {"mode": "scans"})
+
+    def test_parse_multipart_rejects_malformed_body(self) -> None:
+        for body in (b"no delimiter", b"--b\r\nContent-Disposition: form-data\r\n\r\nx"):
+            with self.assertRaises(ValueError):
+                _parse_multipart("multipart/form-data; boundary=b", body)
+        with self.assertRaises(ValueError):
+            _parse_multipart("multipart/form-data", b"--b--\r\n")
+
     def test_index_html_has_api_stitch(self) -> None:
         content = (_WEB_DIR / "index.html").read_text(encoding="utf-8")
         self.assertIn("/api/stitch", content)
@@ -171,19 +476,47 @@ class TestServeCli(unittest.TestCase):
     """Tests for the serve CLI subcommand parsing."""
 
     def test_serve_help(self) -> None:
-        from autoflight.cli import run_serve
-
-        with self.assertRaises(SystemExit) as ctx:
-            run_serve(["--help"])
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaises(SystemExit) as ctx:
+                run_serve(["--help"])
         self.assertEqual(ctx.exception.code, 0)
+        self.assertIn("usage:", stdout.getvalue())
+
+    def test_serve_help_skips_server_import(self) -> None:
+        """'serve --help' should exit before importing the server module."""
+        code = (
+            "import sys\n"
+            "from autoflight.cli import main\n"
+            "try:\n"
+            "    main(['serve', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('autoflight.server' in sys.modules, 'cv2' in sys.modules, file=sys.stderr)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stderr.strip(), "False False")
 
     def test_main_dispatches_serve(self) -> None:
         """main() with 'serve --help' should exit 0."""
-        from autoflight.cli import main
-
-        with self.assertRaises(SystemExit) as ctx:
-            main(["serve", "--help"])
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaises(SystemExit) as ctx:
+                main(["serve", "--help"])
         self.assertEqual(ctx.exception.code, 0)
+        self.assertIn("usage:", stdout.getvalue())
+
+    def test_sniff_subcommand(self) -> None:
+        self.assertEqual(_sniff_subcommand(["serve", "--port", "9000"]), "serve")
+        self.assertEqual(_sniff_subcommand(["images", "out.jpg"]), "main")
+        self.assertEqual(_sniff_subcommand([]), "main")
+
+    def test_serve_parser_defaults(self) -> None:
+        parsed = create_serve_parser().parse_args([])
+        self.assertEqual(parsed.host, "localhost")
+        self.assertEqual(parsed.port, 8080)
+        self.assertFalse(parsed.no_open)
+        self.assertFalse(parsed.reuse_port)
+        self.assertEqual(parsed.max_request_size, 512)
 
 
 if __name__ == "__main__":